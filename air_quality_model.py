@@ -1,7 +1,8 @@
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from data_processor import AirQualityDataProcessor
+from sensor_cleaning import StreamingSensorCleaner
 
 class AirQualityAI:
     """
@@ -11,6 +12,8 @@ class AirQualityAI:
     def __init__(self):
         self.data_processor = AirQualityDataProcessor()
         self.recommendations_db = self._load_recommendations()
+        self.sensor_cleaner = StreamingSensorCleaner()
+        self.recommendation_table = self._build_recommendation_table()
         
     def _load_recommendations(self) -> Dict[str, List[Dict]]:
         """Öneriler veritabanını yükler"""
@@ -147,64 +150,134 @@ class AirQualityAI:
             'normalized_scores': normalized_inputs
         }
     
+    def analyze_sensor_reading(self, sensor_id, reading: Dict[str, float],
+                               zone: Optional[Dict[str, float]] = None,
+                               timestamp: Optional[float] = None) -> Dict:
+        """
+        Ham sensör okumasını temizleyip hava kalitesi analizi yapar.
+        
+        Sensörler yalnızca ölçüm değerlerini gönderir; bölgenin alan ve
+        çalışan sayısı zone ile ayrıca verilir (okumadaki değerler önceliklidir).
+        """
+        cleaned, cleaning_notes = self.sensor_cleaner.clean_reading(sensor_id, reading, timestamp)
+        inputs = {**(zone or {}), **cleaned}
+        
+        errors = [f"{param} için güvenilir sensör verisi yok"
+                  for param in self.sensor_cleaner.parameters if np.isnan(cleaned[param])]
+        # Donmuş veya uzun süre veri göndermeyen sensörler ve bölge bilgisi
+        # eksik okumalar analiz edilmez
+        errors += [f"{field} bilgisi eksik (bölge bilgisi zone ile verilmelidir)"
+                   for field in ('area', 'occupancy') if inputs.get(field) is None]
+        if errors:
+            return {
+                'success': False,
+                'errors': errors,
+                'score': 0,
+                'category': 'Geçersiz',
+                'recommendations': [],
+                'cleaning_notes': cleaning_notes
+            }
+        
+        results = self.analyze_air_quality(inputs)
+        results['cleaning_notes'] = cleaning_notes
+        return results
+    
     def _generate_recommendations(self, inputs: Dict[str, float], 
                                 normalized_inputs: Dict[str, float], 
                                 overall_score: float) -> List[Dict]:
         """AI destekli öneriler oluşturur"""
+        area_per_person = self.data_processor.calculate_area_per_person(inputs['area'], inputs['occupancy'])
+        signature = self.recommendation_signature(
+            overall_score, inputs['temperature'], inputs['humidity'], inputs['co2'], area_per_person
+        )
+        
+        # Önceden hesaplanmış liste tüm oturumlarca paylaşılır; çağırana
+        # aksiyon listeleri dahil kendi kopyası döndürülür
+        return [{**rec, 'actions': list(rec['actions'])} for rec in self.recommendation_table[signature]]
+    
+    def recommendation_signature(self, score, temperature, humidity, co2, area_per_person):
+        """
+        Öneri listesini belirleyen koşul imzasını tamsayı aritmetiği ile hesaplar.
+        
+        Skaler değerlerle veya NumPy dizileriyle çalışır. İmza:
+        ((((genel * 3 + sıcaklık) * 3 + nem) * 3 + co2) * 2 + alan), 0-107 arası.
+        Bantlar: sıcaklık/nem 0=düşük, 1=normal, 2=yüksek; CO2 0=normal, 1=yüksek, 2=çok yüksek.
+        Karşılaştırmalar eski < / > zinciriyle aynıdır; NaN değerler normal banda düşer.
+        """
+        general = np.less(score, 0.4).astype(np.int64)
+        temperature_band = 1 - np.less(temperature, 18).astype(np.int64) + np.greater(temperature, 26)
+        humidity_band = 1 - np.less(humidity, 30).astype(np.int64) + np.greater(humidity, 60)
+        co2_band = np.greater(co2, 1000).astype(np.int64) + np.greater(co2, 1500)
+        area_low = np.less(area_per_person, 15).astype(np.int64)
+        
+        signature = (((general * 3 + temperature_band) * 3 + humidity_band) * 3 + co2_band) * 2 + area_low
+        return int(signature) if np.ndim(signature) == 0 else signature
+    
+    def recommendation_signatures(self, frame: pd.DataFrame, scores: np.ndarray) -> np.ndarray:
+        """
+        Toplu veride her satırın öneri imzasını döndürür.
+        
+        self.recommendation_table[imzalar] tek indeksleme ile satır başına öneri
+        listelerini verir; bu listeler satırlar arasında paylaşıldığı için
+        değiştirilmemelidir.
+        """
+        occupancy = frame['occupancy'].to_numpy(dtype=float)
+        area = frame['area'].to_numpy(dtype=float)
+        area_per_person = np.where(occupancy <= 0, area, area / np.where(occupancy <= 0, 1, occupancy))
+        
+        return self.recommendation_signature(
+            np.asarray(scores, dtype=float),
+            frame['temperature'].to_numpy(dtype=float),
+            frame['humidity'].to_numpy(dtype=float),
+            frame['co2'].to_numpy(dtype=float),
+            area_per_person
+        )
+    
+    def _build_recommendation_table(self) -> np.ndarray:
+        """Tüm 108 koşul imzası için sıralı ve kısaltılmış öneri listelerini hesaplar"""
+        table = np.empty(2 * 3 * 3 * 3 * 2, dtype=object)
+        for general in range(2):
+            for temperature_band in range(3):
+                for humidity_band in range(3):
+                    for co2_band in range(3):
+                        for area_low in range(2):
+                            signature = (((general * 3 + temperature_band) * 3 + humidity_band) * 3
+                                         + co2_band) * 2 + area_low
+                            table[signature] = self._assemble_recommendations(
+                                general, temperature_band, humidity_band, co2_band, area_low
+                            )
+        return table
+    
+    def _assemble_recommendations(self, general: int, temperature_band: int, humidity_band: int,
+                                  co2_band: int, area_low: int) -> List[Dict]:
+        """Bir koşul imzasının öneri listesini oluşturur"""
         recommendations = []
         
         # Genel hava kalitesi önerileri
-        if overall_score < 0.4:
-            recommendations.append({
-                'type': 'general',
-                'priority': 'critical',
-                'title': 'Fabrika Hava Kalitesi Acil İyileştirme',
-                'description': 'Fabrika hava kalitesi kritik seviyede. Acil önlem alınması gerekiyor.',
-                'actions': [
-                    'Tüm endüstriyel havalandırma sistemlerini maksimuma çıkarın',
-                    'Üretim süreçlerini geçici olarak durdurun',
-                    'CO2 ve diğer sensörleri sürekli izleyin',
-                    'Güvenlik ekiplerini çağırın ve protokolleri uygulayın',
-                    'Çalışanları güvenli alanlara yönlendirin'
-                ]
-            })
+        if general:
+            recommendations.append(self._general_recommendation())
         
         # Sıcaklık önerileri
-        if inputs['temperature'] < 18:
-            temp_recs = self._get_parameter_recommendations('temperature', 'low')
-            if temp_recs:
-                recommendations.extend(temp_recs)
-        elif inputs['temperature'] > 26:
-            temp_recs = self._get_parameter_recommendations('temperature', 'high')
-            if temp_recs:
-                recommendations.extend(temp_recs)
+        if temperature_band == 0:
+            recommendations.extend(self._get_parameter_recommendations('temperature', 'low'))
+        elif temperature_band == 2:
+            recommendations.extend(self._get_parameter_recommendations('temperature', 'high'))
         
         # Nem önerileri
-        if inputs['humidity'] < 30:
-            humidity_recs = self._get_parameter_recommendations('humidity', 'low')
-            if humidity_recs:
-                recommendations.extend(humidity_recs)
-        elif inputs['humidity'] > 60:
-            humidity_recs = self._get_parameter_recommendations('humidity', 'high')
-            if humidity_recs:
-                recommendations.extend(humidity_recs)
+        if humidity_band == 0:
+            recommendations.extend(self._get_parameter_recommendations('humidity', 'low'))
+        elif humidity_band == 2:
+            recommendations.extend(self._get_parameter_recommendations('humidity', 'high'))
         
         # CO2 önerileri
-        if inputs['co2'] > 1500:
-            co2_recs = self._get_parameter_recommendations('co2', 'very_high')
-            if co2_recs:
-                recommendations.extend(co2_recs)
-        elif inputs['co2'] > 1000:
-            co2_recs = self._get_parameter_recommendations('co2', 'high')
-            if co2_recs:
-                recommendations.extend(co2_recs)
+        if co2_band == 2:
+            recommendations.extend(self._get_parameter_recommendations('co2', 'very_high'))
+        elif co2_band == 1:
+            recommendations.extend(self._get_parameter_recommendations('co2', 'high'))
         
         # Kişi başına alan önerileri
-        area_per_person = self.data_processor.calculate_area_per_person(inputs['area'], inputs['occupancy'])
-        if area_per_person < 15:
-            area_recs = self._get_parameter_recommendations('area_per_person', 'low')
-            if area_recs:
-                recommendations.extend(area_recs)
+        if area_low:
+            recommendations.extend(self._get_parameter_recommendations('area_per_person', 'low'))
         
         # Önerileri öncelik sırasına göre sırala
         priority_order = {'emergency': 0, 'critical': 1, 'high': 2, 'medium': 3, 'low': 4}
@@ -212,6 +285,22 @@ class AirQualityAI:
         
         return recommendations[:10]  # En önemli 10 öneriyi döndür
     
+    def _general_recommendation(self) -> Dict:
+        """Kritik genel hava kalitesi önerisini döndürür"""
+        return {
+            'type': 'general',
+            'priority': 'critical',
+            'title': 'Fabrika Hava Kalitesi Acil İyileştirme',
+            'description': 'Fabrika hava kalitesi kritik seviyede. Acil önlem alınması gerekiyor.',
+            'actions': [
+                'Tüm endüstriyel havalandırma sistemlerini maksimuma çıkarın',
+                'Üretim süreçlerini geçici olarak durdurun',
+                'CO2 ve diğer sensörleri sürekli izleyin',
+                'Güvenlik ekiplerini çağırın ve protokolleri uygulayın',
+                'Çalışanları güvenli alanlara yönlendirin'
+            ]
+        }
+    
     def _get_parameter_recommendations(self, parameter: str, condition: str) -> List[Dict]:
         """Belirli parametre için önerileri döndürür"""
         recommendations = []
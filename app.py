@@ -4,6 +4,9 @@ import plotly.express as px
 import pandas as pd
 import numpy as np
 from air_quality_model import AirQualityAI
+from zone_overview import ZoneOverview, ZoneReadingSimulator
+from spatial_interpolation import SpatialInterpolator
+from shared_tables import SharedTableStore
 import time
 
 # Sayfa konfigürasyonu
@@ -79,9 +82,170 @@ def load_ai_model():
 
 ai_model = load_ai_model()
 
+# Çok bölgeli görünüm durumu tüm oturumlar arasında paylaşılır
+@st.cache_resource
+def load_zone_overview():
+    return ZoneOverview(ai_model.data_processor), ZoneReadingSimulator(n_zones=400)
+
+ZONE_REFRESH_SECONDS = 10
+
+def render_zone_overview():
+    """Tüm bölgeleri tek sayfada gösteren genel bakış"""
+    overview, feed = load_zone_overview()
+    
+    # Oturum sayısından bağımsız olarak veri en fazla 10 saniyede bir yenilenir
+    overview.refresh(feed.next, ZONE_REFRESH_SECONDS)
+    
+    table = overview.table()
+    valid_scores = table.loc[table['valid'].astype(bool), 'score']
+    
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("🏭 Bölge Sayısı", len(table))
+    col2.metric("📊 Ortalama Skor", f"{valid_scores.mean() * 100:.1f}%" if len(valid_scores) else "-")
+    col3.metric("⚠️ Kritik Bölgeler", int((valid_scores < 0.4).sum()))
+    col4.metric("🔄 Son Yenilemede Değişen", overview.last_changed_count)
+    
+    # Izgara ısı haritası
+    scores, labels = overview.grid()
+    fig = go.Figure(go.Heatmap(
+        z=scores,
+        text=labels,
+        hovertemplate="%{text}<br>Skor: %{z:.2f}<extra></extra>",
+        colorscale=[[0, '#8b0000'], [0.2, '#ff0000'], [0.4, '#ffa500'], [0.6, '#90ee90'], [1, '#00ff00']],
+        zmin=0,
+        zmax=1,
+        xgap=1,
+        ygap=1
+    ))
+    fig.update_layout(
+        title="Bölge Hava Kalitesi Isı Haritası",
+        height=600,
+        xaxis=dict(showticklabels=False),
+        yaxis=dict(showticklabels=False, autorange='reversed')
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Sıralanabilir tablo (sütun başlıklarına tıklanarak sıralanır)
+    st.dataframe(
+        table[['score', 'category', 'temperature', 'humidity', 'co2', 'area_per_person', 'occupancy']],
+        use_container_width=True,
+        height=400,
+        column_config={
+            'score': st.column_config.ProgressColumn("Skor", min_value=0.0, max_value=1.0, format="%.2f"),
+            'category': "Kategori",
+            'temperature': st.column_config.NumberColumn("Sıcaklık (°C)", format="%.1f"),
+            'humidity': st.column_config.NumberColumn("Nem (%)", format="%.0f"),
+            'co2': st.column_config.NumberColumn("CO2 (ppm)", format="%.0f"),
+            'area_per_person': st.column_config.NumberColumn("Alan/Çalışan (m²)", format="%.1f"),
+            'occupancy': st.column_config.NumberColumn("Çalışan Sayısı", format="%d")
+        }
+    )
+
+def render_zone_detail():
+    """Seçilen bölgenin önerilerini yalnızca seçim yapıldığında hesaplar"""
+    overview, _ = load_zone_overview()
+    # Seçenekler sabit sırada ve bileşen sabit anahtarlı tutulur; skor sırası
+    # yenilemede değişse de seçim korunur
+    selected_zone = st.selectbox("🔍 Bölge Detayı", ["Seçiniz"] + overview.zone_ids(), key='zone_detail')
+    
+    if selected_zone != "Seçiniz" and not overview.is_valid(selected_zone):
+        st.warning("⚠️ Bu bölgenin son okuması geçersiz veya eksik; öneri üretilemedi.")
+    elif selected_zone != "Seçiniz":
+        results = ai_model.analyze_air_quality(overview.inputs(selected_zone))
+        if not results['success']:
+            for error in results['errors']:
+                st.write(f"• {error}")
+        elif results['recommendations']:
+            for rec in results['recommendations']:
+                with st.expander(f"🔧 {rec['title']} ({rec['priority'].title()})"):
+                    st.write(rec['description'])
+                    for j, action in enumerate(rec['actions'], 1):
+                        st.write(f"{j}. {action}")
+        else:
+            st.success("🎉 Bu bölgede iyileştirme önerisi bulunmuyor.")
+
+# Kat yerleşimi ağırlıkları bir kez hesaplanır, her yenileme tek matris çarpımıdır
+@st.cache_resource
+def load_floor_interpolator():
+    rng = np.random.default_rng(7)
+    n_sensors = 60
+    positions = pd.DataFrame({
+        'x': rng.uniform(0, 120, n_sensors),
+        'y': rng.uniform(0, 80, n_sensors)
+    }, index=[f"B{i + 1:03d}" for i in range(n_sensors)])
+    
+    interpolator = SpatialInterpolator(ai_model.data_processor)
+    
+    # HAVA_SHARED_TABLES_DIR tanımlıysa ilk süreç ağırlıkları yayınlar,
+    # diğer süreçler yeniden hesaplamak yerine salt okunur bağlanır
+    interpolator.load_floor('Kat 1', positions, width=120, height=80,
+                            store=SharedTableStore.from_environment(), grid_shape=(160, 240))
+    return interpolator, positions, ZoneReadingSimulator(n_zones=n_sensors, seed=7)
+
+def render_floor_heatmap():
+    """Sensörler arasındaki sıcak noktaları gösteren kat ısı haritası"""
+    interpolator, positions, feed = load_floor_interpolator()
+    
+    parameter_labels = {
+        'score': "Hava Kalitesi Skoru",
+        'temperature': "Sıcaklık (°C)",
+        'humidity': "Nem (%)",
+        'co2': "CO2 (ppm)"
+    }
+    parameter = st.sidebar.selectbox(
+        "🗺️ Gösterilecek Parametre",
+        list(parameter_labels),
+        format_func=parameter_labels.get
+    )
+    
+    # Tüm oturumlar ve parametre seçimleri aynı anlık görüntüyü kullanır
+    grids = interpolator.refresh_floor('Kat 1', feed.next, ZONE_REFRESH_SECONDS)['grids']
+    layout = interpolator.layouts['Kat 1']
+    
+    fig = go.Figure(go.Heatmap(
+        x=layout.x,
+        y=layout.y,
+        z=grids[parameter],
+        colorscale='RdYlGn' if parameter == 'score' else 'RdYlGn_r',
+        colorbar=dict(title=parameter_labels[parameter])
+    ))
+    fig.add_trace(go.Scatter(
+        x=positions['x'],
+        y=positions['y'],
+        mode='markers',
+        marker=dict(color='black', size=6),
+        text=positions.index,
+        hovertemplate="%{text}<extra></extra>",
+        name='Sensörler'
+    ))
+    fig.update_layout(
+        title=f"Kat 1 - {parameter_labels[parameter]}",
+        height=600,
+        xaxis=dict(title="x (m)"),
+        yaxis=dict(title="y (m)", scaleanchor='x')
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
 # Ana başlık
 st.markdown('<h1 class="main-header">🏭 Fabrika Hava Kalitesi Analiz ve Öneri Sistemi</h1>', unsafe_allow_html=True)
 
+# Görünüm seçimi
+view_mode = st.sidebar.radio("📑 Görünüm", ["Tek Alan Analizi", "Çok Bölgeli Genel Bakış", "Kat Isı Haritası"])
+
+if view_mode == "Çok Bölgeli Genel Bakış":
+    # Destekleyen Streamlit sürümlerinde yalnızca genel bakış bölümü yenilenir
+    if hasattr(st, "fragment"):
+        st.fragment(run_every=ZONE_REFRESH_SECONDS)(render_zone_overview)()
+    else:
+        render_zone_overview()
+        st.button("🔄 Yenile")
+    render_zone_detail()
+    st.stop()
+
+if view_mode == "Kat Isı Haritası":
+    render_floor_heatmap()
+    st.stop()
+
 # Sidebar - Girdi parametreleri
 st.sidebar.header("🏭 Fabrika Parametreleri")
 
@@ -18,6 +18,14 @@ class AirQualityDataProcessor:
             'occupancy': {'min': 1, 'max': 100, 'optimal': 10}     # kişi
         }
         
+        # Hava kalitesi skorundaki parametre ağırlıkları
+        self.weights = {
+            'temperature': 0.25,
+            'humidity': 0.20,
+            'co2': 0.35,
+            'area_per_person': 0.20
+        }
+        
         self.scaler = StandardScaler()
         
     def calculate_area_per_person(self, area: float, occupancy: int) -> float:
@@ -96,17 +104,10 @@ class AirQualityDataProcessor:
     
     def calculate_air_quality_score(self, normalized_inputs: Dict[str, float]) -> float:
         """Normalize edilmiş girdilerden hava kalitesi skorunu hesaplar"""
-        weights = {
-            'temperature': 0.25,
-            'humidity': 0.20,
-            'co2': 0.35,
-            'area_per_person': 0.20
-        }
-        
         total_score = 0
         total_weight = 0
         
-        for param, weight in weights.items():
+        for param, weight in self.weights.items():
             if param in normalized_inputs:
                 total_score += normalized_inputs[param] * weight
                 total_weight += weight
@@ -116,6 +117,76 @@ class AirQualityDataProcessor:
             
         return total_score / total_weight
     
+    def normalize_batch(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Çok sayıda girdiyi tek vektörel adımda normalize eder"""
+        occupancy = frame['occupancy'].to_numpy(dtype=float)
+        area = frame['area'].to_numpy(dtype=float)
+        area_per_person = np.where(occupancy <= 0, area, area / np.where(occupancy <= 0, 1, occupancy))
+        
+        columns = {
+            'temperature': frame['temperature'].to_numpy(dtype=float),
+            'humidity': frame['humidity'].to_numpy(dtype=float),
+            'co2': frame['co2'].to_numpy(dtype=float),
+            'area_per_person': area_per_person
+        }
+        
+        normalized = {}
+        for param, values in columns.items():
+            ref = self.reference_values[param]
+            normalized[param] = self._normalize_array(
+                values, ref['min'], ref['max'], ref['optimal'], reverse=(param == 'co2')
+            )
+        
+        return pd.DataFrame(normalized, index=frame.index)
+    
+    def _normalize_array(self, values: np.ndarray, min_val: float, max_val: float,
+                         optimal: float, reverse: bool = False) -> np.ndarray:
+        """_normalize_value fonksiyonunun dizi karşılığı"""
+        if optimal - min_val == 0:
+            below = np.ones_like(values)
+        else:
+            below = (values - min_val) / (optimal - min_val)
+        if max_val - optimal == 0:
+            above = np.zeros_like(values)
+        else:
+            above = 1.0 - ((values - optimal) / (max_val - optimal))
+        
+        score = np.clip(np.where(values <= optimal, below, above), 0.0, 1.0)
+        
+        if reverse:
+            score = 1.0 - score
+        
+        return score
+    
+    def calculate_air_quality_scores(self, normalized: pd.DataFrame) -> np.ndarray:
+        """normalize_batch çıktısından toplu hava kalitesi skorlarını hesaplar"""
+        params = [param for param in self.weights if param in normalized.columns]
+        if not params:
+            return np.zeros(len(normalized))
+        
+        weights = np.array([self.weights[param] for param in params])
+        return normalized[params].to_numpy(dtype=float) @ weights / weights.sum()
+    
+    def get_air_quality_categories(self, scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Skor dizisi için kategori ve renk dizilerini döndürür"""
+        scores = np.asarray(scores, dtype=float)
+        bins = np.array([0.2, 0.4, 0.6, 0.8])
+        categories = np.array(["Çok Kötü", "Kötü", "Orta", "İyi", "Mükemmel"], dtype=object)
+        colors = np.array(["darkred", "red", "orange", "lightgreen", "green"], dtype=object)
+        
+        level = np.searchsorted(bins, scores, side='right')
+        return categories[level], colors[level]
+    
+    def validate_batch(self, frame: pd.DataFrame) -> np.ndarray:
+        """validate_inputs kurallarına göre her satırın geçerli olup olmadığını döndürür"""
+        return (
+            frame['temperature'].between(-10, 50).to_numpy()
+            & frame['humidity'].between(0, 100).to_numpy()
+            & frame['co2'].between(300, 5000).to_numpy()
+            & (frame['area'] > 0).to_numpy()
+            & (frame['occupancy'] >= 0).to_numpy()
+        )
+    
     def get_air_quality_category(self, score: float) -> Tuple[str, str]:
         """Hava kalitesi skoruna göre kategori ve renk döndürür"""
         if score >= 0.8:
@@ -0,0 +1,422 @@
+"""
+Panel ve puanlama yolu için eşzamanlı kullanıcı yük testi.
+
+Her oturum ayrı bir istemci sürecinde çalışır. Eşzamanlılık kademeli olarak
+artırılır ve her kademe için gecikme yüzdelikleri raporlanır.
+
+Hedefler:
+    scoring   - AirQualityAI.analyze_air_quality çağrıları (süreç başına
+                CPU ve bellek istemci süreçlerinden ölçülür)
+    dashboard - yerelde başlatılan tek bir Streamlit sunucusuna, tarayıcının
+                kullandığı websocket oturum protokolü (/_stcore/stream) ile
+                bağlanır. Her oturum kaydırıcı ve sayı girişlerini değiştirip
+                analiz butonuna basan yeniden çalıştırma mesajları gönderir ve
+                betik bitene kadar bekler. CPU ve bellek sunucu sürecinden
+                ölçülür; böylece aynı sunucudaki oturumların çekişmesi görülür.
+
+Örnek:
+    python load_test.py --target dashboard --levels 1,2,4,8 --duration 30
+"""
+import argparse
+import contextlib
+import multiprocessing as mp
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+
+
+def _random_inputs(rng: random.Random) -> Dict[str, float]:
+    """Kaydırıcı aralıklarından rastgele girdi üretir"""
+    return {
+        'temperature': round(rng.uniform(-10, 50) * 2) / 2,
+        'humidity': float(rng.randint(0, 100)),
+        'co2': rng.randrange(300, 5001, 50),
+        'area': float(rng.randint(1, 1000)),
+        'occupancy': rng.randint(0, 200)
+    }
+
+
+def _scoring_session(seed: int, base_url: Optional[str], stack: contextlib.ExitStack):
+    """Puanlama yolunu doğrudan çağıran oturum"""
+    from air_quality_model import AirQualityAI
+    ai_model = AirQualityAI()
+    rng = random.Random(seed)
+
+    def step():
+        ai_model.analyze_air_quality(_random_inputs(rng))
+    return step
+
+
+class DashboardSession:
+    """
+    Streamlit sunucusuna tarayıcı gibi bağlanan websocket oturumu.
+
+    İlk çalıştırmada bileşen kimlikleri etiketlerinden bulunur; sonraki
+    adımlarda bileşen durumları (widget state) ile yeniden çalıştırma
+    mesajı gönderilir ve sunucu betiği bitirene kadar yanıtlar okunur.
+    """
+
+    def __init__(self, base_url: str, timeout: float = 120.0):
+        try:
+            from websockets.sync.client import connect
+        except ImportError:
+            raise ImportError("dashboard hedefi için 'websockets' paketi gereklidir: pip install websockets")
+        self.timeout = timeout
+        self._stack = contextlib.ExitStack()
+        self.connection = self._stack.enter_context(
+            connect(base_url.replace('http', 'ws', 1) + '/_stcore/stream', max_size=None, open_timeout=timeout)
+        )
+        self.widgets = {}
+        try:
+            self.rerun([])
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        self._stack.close()
+
+    def rerun(self, widget_states: List) -> int:
+        """Yeniden çalıştırma ister, betik bitene kadar bekler ve eleman sayısını döndürür"""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        message = BackMsg()
+        message.rerun_script.query_string = ''
+        message.rerun_script.widget_states.widgets.extend(widget_states)
+        self.connection.send(message.SerializeToString())
+
+        elements = 0
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(self.connection.recv(timeout=self.timeout))
+            kind = forward.WhichOneof('type')
+            if kind == 'delta' and forward.delta.WhichOneof('type') == 'new_element':
+                element = forward.delta.new_element
+                element_type = element.WhichOneof('type')
+                if element_type == 'exception':
+                    raise RuntimeError(element.exception.message)
+                widget = getattr(element, element_type)
+                if getattr(widget, 'id', '') and getattr(widget, 'label', ''):
+                    self.widgets[widget.label] = widget
+                elements += 1
+            elif kind == 'script_finished':
+                if forward.script_finished != ForwardMsg.FINISHED_SUCCESSFULLY:
+                    raise RuntimeError(f"Betik tamamlanamadı (durum {forward.script_finished})")
+                return elements
+
+    def widget(self, label_part: str):
+        return _find_widget(self.widgets.values(), label_part)
+
+    def slider_state(self, label_part: str, value: float):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+        state = WidgetState(id=self.widget(label_part).id)
+        state.double_array_value.data.append(value)
+        return state
+
+    def number_state(self, label_part: str, value: float):
+        from streamlit.proto.NumberInput_pb2 import NumberInput
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+        widget = self.widget(label_part)
+        if widget.data_type == NumberInput.INT:
+            return WidgetState(id=widget.id, int_value=int(value))
+        return WidgetState(id=widget.id, double_value=float(value))
+
+    def button_state(self, label_part: str):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+        return WidgetState(id=self.widget(label_part).id, trigger_value=True)
+
+
+def _find_widget(widgets, label_part: str):
+    for widget in widgets:
+        if label_part in widget.label:
+            return widget
+    raise LookupError(f"Bileşen bulunamadı: {label_part}")
+
+
+def _dashboard_session(seed: int, base_url: str, stack: contextlib.ExitStack):
+    """Kaydırıcıları değiştirip analiz butonuna basan bir tarayıcı oturumu"""
+    session = DashboardSession(base_url)
+    stack.callback(session.close)
+    rng = random.Random(seed)
+
+    def step():
+        inputs = _random_inputs(rng)
+        session.rerun([
+            session.slider_state("Sıcaklığı", inputs['temperature']),
+            session.slider_state("Nem", inputs['humidity']),
+            session.slider_state("CO2", inputs['co2']),
+            session.number_state("Alan", inputs['area']),
+            session.number_state("Çalışan", inputs['occupancy']),
+            session.button_state("Analiz")
+        ])
+    return step
+
+
+SESSION_FACTORIES = {
+    'scoring': _scoring_session,
+    'dashboard': _dashboard_session
+}
+
+
+def _session_worker(target: str, seed: int, duration: float, start_at: float,
+                    base_url: Optional[str], results: mp.Queue):
+    """Tek bir oturumu süre boyunca çalıştırır ve ölçümleri kuyruğa yazar"""
+    with contextlib.ExitStack() as stack:
+        try:
+            step = SESSION_FACTORIES[target](seed, base_url, stack)
+        except Exception as exc:
+            results.put({'latencies': [], 'errors': 1, 'error': repr(exc), 'cpu_seconds': 0.0, 'max_rss_kb': 0})
+            return
+
+        # Tüm oturumlar aynı anda başlar; hazırlık süresi ölçüme dahil edilmez
+        time.sleep(max(0.0, start_at - time.time()))
+        usage_start = resource.getrusage(resource.RUSAGE_SELF)
+
+        latencies: List[float] = []
+        errors = 0
+        last_error = None
+        end_at = time.time() + duration
+        while time.time() < end_at:
+            started = time.perf_counter()
+            try:
+                step()
+                latencies.append(time.perf_counter() - started)
+            except Exception as exc:
+                errors += 1
+                last_error = repr(exc)
+
+        usage_end = resource.getrusage(resource.RUSAGE_SELF)
+    results.put({
+        'latencies': latencies,
+        'errors': errors,
+        'error': last_error,
+        'cpu_seconds': (usage_end.ru_utime - usage_start.ru_utime) + (usage_end.ru_stime - usage_start.ru_stime),
+        'max_rss_kb': usage_end.ru_maxrss
+    })
+
+
+def run_level(target: str, sessions: int, duration: float, base_url: Optional[str] = None,
+              warmup: float = 15.0, server_pid: Optional[int] = None,
+              server_baseline_rss_mb: float = float('nan')) -> Dict:
+    """
+    Belirli sayıda eşzamanlı oturumla bir kademe çalıştırır.
+
+    server_pid verilirse ölçüm penceresi boyunca sunucu sürecinin CPU süresi
+    ve en yüksek bellek kullanımı da örneklenir.
+    """
+    ctx = mp.get_context('spawn')
+    results = ctx.Queue()
+    start_at = time.time() + warmup
+    workers = [
+        ctx.Process(target=_session_worker, args=(target, i, duration, start_at, base_url, results))
+        for i in range(sessions)
+    ]
+    for worker in workers:
+        worker.start()
+
+    server = {}
+    if server_pid is not None:
+        server = _monitor_process(server_pid, start_at, start_at + duration)
+
+    collected = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    latencies = np.array([lat for item in collected for lat in item['latencies']])
+    requests_done = len(latencies)
+    errors = sum(item['errors'] for item in collected)
+
+    def percentile(q):
+        return float(np.percentile(latencies, q) * 1000) if requests_done else float('nan')
+
+    row = {
+        'target': target,
+        'sessions': sessions,
+        'requests': requests_done,
+        'errors': errors,
+        'throughput_rps': requests_done / duration,
+        'p50_ms': percentile(50),
+        'p90_ms': percentile(90),
+        'p95_ms': percentile(95),
+        'p99_ms': percentile(99),
+        'max_ms': float(latencies.max() * 1000) if requests_done else float('nan'),
+        'cpu_seconds_per_session': float(np.mean([item['cpu_seconds'] for item in collected])),
+        'cpu_ms_per_request': (
+            sum(item['cpu_seconds'] for item in collected) / requests_done * 1000 if requests_done else float('nan')
+        ),
+        'max_rss_mb_per_session': float(np.mean([item['max_rss_kb'] for item in collected]) / 1024),
+        'last_error': next((item['error'] for item in collected if item['error']), None)
+    }
+    if server:
+        row.update({
+            'server_cpu_ms_per_request': (
+                server['cpu_seconds'] / requests_done * 1000 if requests_done else float('nan')
+            ),
+            'server_cpu_util': server['cpu_seconds'] / duration,
+            'server_rss_mb': server['peak_rss_mb'],
+            'server_rss_mb_per_session': (server['peak_rss_mb'] - server_baseline_rss_mb) / sessions
+        })
+    return row
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_local_server(port: Optional[int] = None, timeout: float = 60.0):
+    """app.py için yerel bir Streamlit sunucusu başlatır ve hazır olmasını bekler"""
+    import requests
+    port = port or _free_port()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', APP_PATH,
+         '--server.headless', 'true', '--server.port', str(port),
+         '--browser.gatherUsageStats', 'false'],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(base_url + '/_stcore/health', timeout=2).ok:
+                return process, base_url
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError("Streamlit sunucusu zamanında başlamadı")
+
+
+def _process_rss_mb(pid: int) -> float:
+    """Linux'ta bir sürecin anlık bellek kullanımını (/proc) okur"""
+    try:
+        with open(f"/proc/{pid}/status", 'r') as fh:
+            for line in fh:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return float('nan')
+
+
+def _process_cpu_seconds(pid: int) -> float:
+    """Linux'ta bir sürecin toplam kullanıcı + sistem CPU süresini (/proc) okur"""
+    try:
+        with open(f"/proc/{pid}/stat", 'r') as fh:
+            fields = fh.read().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    except (OSError, IndexError, ValueError):
+        return float('nan')
+
+
+def _monitor_process(pid: int, start_at: float, end_at: float, interval: float = 0.5) -> Dict[str, float]:
+    """Ölçüm penceresi boyunca sürecin CPU süresini ve en yüksek belleğini örnekler"""
+    time.sleep(max(0.0, start_at - time.time()))
+    cpu_start = _process_cpu_seconds(pid)
+    peak_rss = _process_rss_mb(pid)
+    while time.time() < end_at:
+        time.sleep(min(interval, max(0.0, end_at - time.time())))
+        peak_rss = np.nanmax([peak_rss, _process_rss_mb(pid)])
+    return {
+        'cpu_seconds': _process_cpu_seconds(pid) - cpu_start,
+        'peak_rss_mb': float(peak_rss)
+    }
+
+
+def write_report(rows: List[Dict], path: str):
+    """Sonuçları Markdown rapor ve yanında CSV olarak yazar"""
+    table = pd.DataFrame(rows)
+    table.to_csv(os.path.splitext(path)[0] + '.csv', index=False)
+
+    columns = ['sessions', 'requests', 'errors', 'throughput_rps', 'p50_ms', 'p90_ms', 'p95_ms', 'p99_ms']
+    if rows and 'server_rss_mb' in rows[0]:
+        # Panel hedefinde istemci süreçleri yalnızca yük üretir; kaynaklar sunucudan ölçülür
+        columns += ['server_cpu_ms_per_request', 'server_cpu_util', 'server_rss_mb', 'server_rss_mb_per_session']
+    else:
+        columns += ['cpu_ms_per_request', 'max_rss_mb_per_session']
+    header = "| " + " | ".join(columns) + " |"
+    separator = "|" + "---|" * len(columns)
+    lines = [
+        "# Yük Testi Raporu",
+        "",
+        f"- Hedef: `{rows[0]['target']}`" if rows else "",
+        f"- Tarih: {time.strftime('%Y-%m-%d %H:%M')}",
+        f"- CPU çekirdeği: {os.cpu_count()}",
+        "",
+        header,
+        separator
+    ]
+    for row in rows:
+        lines.append("| " + " | ".join(
+            f"{row[column]:.2f}" if isinstance(row[column], float) else str(row[column])
+            for column in columns
+        ) + " |")
+
+    errors = [row for row in rows if row['last_error']]
+    if errors:
+        lines += ["", "## Hatalar", ""]
+        lines += [f"- {row['sessions']} oturum: `{row['last_error']}`" for row in errors]
+
+    with open(path, 'w', encoding='utf-8') as fh:
+        fh.write("\n".join(lines) + "\n")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Hava kalitesi paneli yük testi")
+    parser.add_argument('--target', choices=sorted(SESSION_FACTORIES), default='dashboard')
+    parser.add_argument('--levels', default='1,2,4,8,16', help="Virgülle ayrılmış eşzamanlı oturum sayıları")
+    parser.add_argument('--duration', type=float, default=30.0, help="Kademe başına ölçüm süresi (sn)")
+    parser.add_argument('--warmup', type=float, default=15.0, help="Oturum hazırlığı için bekleme (sn)")
+    parser.add_argument('--max-p95-ms', type=float, default=None,
+                        help="p95 gecikmesi bu değeri aşarsa kademe artırımı durdurulur")
+    parser.add_argument('--port', type=int, default=None, help="dashboard hedefi için sunucu portu")
+    parser.add_argument('--report', default='load_test_report.md')
+    args = parser.parse_args(argv)
+
+    levels = [int(level) for level in args.levels.split(',')]
+    server, base_url = (None, None)
+    baseline_rss = float('nan')
+    if args.target == 'dashboard':
+        server, base_url = start_local_server(args.port)
+        # Paylaşılan kaynaklar (model, önbellekler) ilk oturumda yüklenir;
+        # oturum başına bellek bu ısınmadan sonraki değere göre hesaplanır
+        session = DashboardSession(base_url)
+        session.close()
+        time.sleep(1.0)
+        baseline_rss = _process_rss_mb(server.pid)
+
+    rows = []
+    try:
+        for sessions in levels:
+            row = run_level(args.target, sessions, args.duration, base_url, args.warmup,
+                            server_pid=server.pid if server is not None else None,
+                            server_baseline_rss_mb=baseline_rss)
+            rows.append(row)
+            print(f"{sessions:>4} oturum: {row['throughput_rps']:.1f} istek/sn, "
+                  f"p50 {row['p50_ms']:.0f} ms, p95 {row['p95_ms']:.0f} ms, hata {row['errors']}")
+            if args.max_p95_ms is not None and row['p95_ms'] > args.max_p95_ms:
+                print("p95 sınırı aşıldı, kademe artırımı durduruldu")
+                break
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    write_report(rows, args.report)
+    print(f"Rapor: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+import copy
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Optional, Union
+from air_quality_model import AirQualityAI
+from data_processor import AirQualityDataProcessor
+
+INPUT_COLUMNS = ['temperature', 'humidity', 'co2', 'area', 'occupancy']
+ALERT_PRIORITIES = ('emergency', 'critical')
+
+
+def default_replay_config(ai_model: Optional[AirQualityAI] = None) -> Dict:
+    """
+    Mevcut ağırlık, referans değer ve öneri eşiklerinden bir tekrar oynatma
+    yapılandırması oluşturur. Karşılaştırma için kopyası değiştirilebilir.
+    """
+    ai_model = ai_model or AirQualityAI()
+    processor = ai_model.data_processor
+
+    thresholds = {'general_score': 0.4}
+    for parameter, rules in ai_model.recommendations_db.items():
+        for rule in rules:
+            thresholds[f"{parameter}_{rule['condition']}"] = rule['threshold']
+
+    return {
+        'weights': dict(processor.weights),
+        'reference_values': copy.deepcopy(processor.reference_values),
+        'thresholds': thresholds
+    }
+
+
+class ReplayEngine:
+    """
+    Kayıtlı okumaları doğrulama, puanlama ve öneri kurallarından toplu halde
+    geçirerek bir veya daha fazla yapılandırmanın üreteceği uyarı ve öneri
+    sayılarını hesaplayan sınıf.
+
+    Okumalar parçalar halinde vektörel olarak işlenir; uzun tekrarlar düzenli
+    aralıklarla kontrol noktasına yazılır ve kesintiden sonra kaldığı yerden
+    devam eder.
+    """
+
+    def __init__(self, configs: Dict[str, Dict], chunk_size: int = 200_000,
+                 checkpoint_path: Optional[str] = None, checkpoint_every: int = 10):
+        self.configs = configs
+        self.chunk_size = chunk_size
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+
+        # Kural öncelikleri öneri veritabanından alınır
+        ai_model = AirQualityAI()
+        self.rule_priorities = {'general_score': 'critical'}
+        for parameter, rules in ai_model.recommendations_db.items():
+            for rule in rules:
+                self.rule_priorities[f"{parameter}_{rule['condition']}"] = rule['priority']
+
+        self.processors = {}
+        for name, config in configs.items():
+            processor = AirQualityDataProcessor()
+            processor.weights = dict(config['weights'])
+            processor.reference_values = copy.deepcopy(config['reference_values'])
+            self.processors[name] = processor
+
+        self.rows_done = 0
+        self.stats = {name: self._empty_stats() for name in configs}
+
+    def _empty_stats(self) -> Dict:
+        return {
+            'rows': 0,
+            'invalid_rows': 0,
+            'score_sum': 0.0,
+            'alert_rows': 0,
+            'recommendations': 0,
+            'rules': {rule: 0 for rule in self.rule_priorities},
+            'priorities': {priority: 0 for priority in sorted(set(self.rule_priorities.values()))},
+            'categories': {}
+        }
+
+    def _config_fingerprint(self) -> str:
+        """Kontrol noktasının aynı yapılandırmalara ait olduğunu doğrulamak için özet"""
+        payload = json.dumps(self.configs, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _fired_rules(self, chunk: pd.DataFrame, thresholds: Dict[str, float],
+                     scores: np.ndarray) -> Dict[str, np.ndarray]:
+        """_generate_recommendations kurallarının vektörel karşılığı"""
+        temperature = chunk['temperature'].to_numpy(dtype=float)
+        humidity = chunk['humidity'].to_numpy(dtype=float)
+        co2 = chunk['co2'].to_numpy(dtype=float)
+        area = chunk['area'].to_numpy(dtype=float)
+        occupancy = chunk['occupancy'].to_numpy(dtype=float)
+        area_per_person = np.where(occupancy <= 0, area, area / np.where(occupancy <= 0, 1, occupancy))
+
+        temperature_low = temperature < thresholds['temperature_low']
+        humidity_low = humidity < thresholds['humidity_low']
+        co2_very_high = co2 > thresholds['co2_very_high']
+
+        return {
+            'general_score': scores < thresholds['general_score'],
+            'temperature_low': temperature_low,
+            'temperature_high': ~temperature_low & (temperature > thresholds['temperature_high']),
+            'humidity_low': humidity_low,
+            'humidity_high': ~humidity_low & (humidity > thresholds['humidity_high']),
+            'co2_very_high': co2_very_high,
+            'co2_high': ~co2_very_high & (co2 > thresholds['co2_high']),
+            'area_per_person_low': area_per_person < thresholds['area_per_person_low']
+        }
+
+    def process_chunk(self, chunk: pd.DataFrame):
+        """Bir veri parçasını tüm yapılandırmalar için işler ve istatistiklere ekler"""
+        chunk = chunk[INPUT_COLUMNS]
+        for name, processor in self.processors.items():
+            stats = self.stats[name]
+            valid = processor.validate_batch(chunk)
+            valid_rows = chunk[valid]
+
+            normalized = processor.normalize_batch(valid_rows)
+            scores = processor.calculate_air_quality_scores(normalized)
+            categories, _ = processor.get_air_quality_categories(scores)
+
+            fired = self._fired_rules(valid_rows, self.configs[name]['thresholds'], scores)
+            alert = np.zeros(len(valid_rows), dtype=bool)
+            for rule, mask in fired.items():
+                count = int(mask.sum())
+                priority = self.rule_priorities[rule]
+                stats['rules'][rule] += count
+                stats['priorities'][priority] += count
+                stats['recommendations'] += count
+                if priority in ALERT_PRIORITIES:
+                    alert |= mask
+
+            stats['rows'] += len(chunk)
+            stats['invalid_rows'] += int((~valid).sum())
+            stats['score_sum'] += float(scores.sum())
+            stats['alert_rows'] += int(alert.sum())
+            labels, counts = np.unique(categories, return_counts=True)
+            for label, count in zip(labels, counts):
+                stats['categories'][label] = stats['categories'].get(label, 0) + int(count)
+
+        self.rows_done += len(chunk)
+
+    def _load_checkpoint(self, source_id: str) -> bool:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return False
+        with open(self.checkpoint_path, 'r', encoding='utf-8') as fh:
+            checkpoint = json.load(fh)
+        if checkpoint.get('fingerprint') != self._config_fingerprint() or checkpoint.get('source') != source_id:
+            return False
+        self.rows_done = checkpoint['rows_done']
+        self.stats = checkpoint['stats']
+        return True
+
+    def _save_checkpoint(self, source_id: str, finished: bool = False):
+        if not self.checkpoint_path:
+            return
+        checkpoint = {
+            'fingerprint': self._config_fingerprint(),
+            'source': source_id,
+            'rows_done': self.rows_done,
+            'finished': finished,
+            'stats': self.stats
+        }
+        # Yarım yazılmış kontrol noktası kalmaması için önce geçici dosyaya yazılır
+        tmp_path = self.checkpoint_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as fh:
+            json.dump(checkpoint, fh, ensure_ascii=False)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _chunks(self, source: Union[str, pd.DataFrame], skip: int) -> Iterable[pd.DataFrame]:
+        if isinstance(source, pd.DataFrame):
+            for start in range(skip, len(source), self.chunk_size):
+                yield source.iloc[start:start + self.chunk_size]
+        else:
+            reader = pd.read_csv(
+                source,
+                usecols=INPUT_COLUMNS,
+                skiprows=range(1, skip + 1) if skip else None,
+                chunksize=self.chunk_size
+            )
+            for chunk in reader:
+                yield chunk
+
+    def run(self, source: Union[str, pd.DataFrame], source_id: Optional[str] = None) -> pd.DataFrame:
+        """
+        Kayıtlı okumaları tekrar oynatır.
+
+        source: INPUT_COLUMNS sütunlarını içeren CSV dosya yolu veya tablo.
+        source_id: kontrol noktası eşlemesi için kaynak adı (varsayılan: dosya yolu).
+        Yapılandırmaları yan yana karşılaştıran özet tabloyu döndürür.
+        """
+        if source_id is None:
+            source_id = source if isinstance(source, str) else 'dataframe'
+
+        if not self._load_checkpoint(source_id):
+            self.rows_done = 0
+            self.stats = {name: self._empty_stats() for name in self.configs}
+
+        for i, chunk in enumerate(self._chunks(source, self.rows_done), 1):
+            self.process_chunk(chunk)
+            if i % self.checkpoint_every == 0:
+                self._save_checkpoint(source_id)
+
+        self._save_checkpoint(source_id, finished=True)
+        return self.summary()
+
+    def summary(self) -> pd.DataFrame:
+        """İstatistikleri yapılandırma başına bir sütun olacak şekilde tablolaştırır"""
+        columns = {}
+        for name, stats in self.stats.items():
+            valid_rows = stats['rows'] - stats['invalid_rows']
+            column = {
+                'Okuma': stats['rows'],
+                'Geçersiz Okuma': stats['invalid_rows'],
+                'Ortalama Skor': stats['score_sum'] / valid_rows if valid_rows else 0.0,
+                'Uyarı Üreten Okuma': stats['alert_rows'],
+                'Toplam Öneri': stats['recommendations']
+            }
+            for priority, count in stats['priorities'].items():
+                column[f"Öncelik: {priority}"] = count
+            for rule, count in stats['rules'].items():
+                column[f"Kural: {rule}"] = count
+            for category, count in sorted(stats['categories'].items()):
+                column[f"Kategori: {category}"] = count
+            columns[name] = column
+
+        summary = pd.DataFrame(columns).fillna(0)
+        if len(columns) == 2:
+            first, second = list(columns)
+            summary['Fark'] = summary[second] - summary[first]
+        return summary
+
+
+def compare_configs(source: Union[str, pd.DataFrame], config_a: Dict, config_b: Dict,
+                    checkpoint_path: Optional[str] = None, **options) -> pd.DataFrame:
+    """İki yapılandırmayı tek geçişte tekrar oynatır ve yan yana özet döndürür"""
+    engine = ReplayEngine({'A': config_a, 'B': config_b}, checkpoint_path=checkpoint_path, **options)
+    return engine.run(source)
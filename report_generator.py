@@ -0,0 +1,363 @@
+import csv
+import hashlib
+import html
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from string import Template
+from typing import Dict, List, Optional, Sequence
+import pandas as pd
+from air_quality_model import AirQualityAI
+
+INPUT_COLUMNS = ['temperature', 'humidity', 'co2', 'area', 'occupancy']
+SUMMARY_COLUMNS = ['zone', 'score', 'category', 'recommendation_count', 'top_priority']
+
+PARAMETER_LABELS = {
+    'temperature': 'Sıcaklık',
+    'humidity': 'Nem',
+    'co2': 'CO2',
+    'area': 'Alan',
+    'area_per_person': 'Kişi Başına Alan',
+    'occupancy': 'Çalışan Sayısı'
+}
+
+COLOR_MAP = {
+    'green': '#00ff00',
+    'lightgreen': '#90ee90',
+    'orange': '#ffa500',
+    'red': '#ff0000',
+    'darkred': '#8b0000'
+}
+
+# Şablonlar modül yüklenirken bir kez derlenir ve tüm bölgelerde yeniden kullanılır
+ZONE_PAGE = Template("""<!DOCTYPE html>
+<html lang="tr">
+<head>
+<meta charset="utf-8">
+<title>$zone - Hava Kalitesi Raporu</title>
+<link rel="stylesheet" href="../assets/report.css">
+</head>
+<body>
+<h1>🏭 $zone - Vardiya Sonu Hava Kalitesi Raporu</h1>
+<p class="meta">$shift</p>
+<div class="score" style="background-color: $color;">$score</div>
+<h2 style="color: $color;">$category</h2>
+<h3>Detaylı Analiz</h3>
+<table>
+<tr><th>Parametre</th><th>Değer</th><th>Skor</th><th>Durum</th><th>Optimal Aralık</th></tr>
+$rows
+</table>
+<h3>Trend</h3>
+$trend
+<h3>Öneriler</h3>
+$recommendations
+<p><a href="../index.html">← Tüm bölgeler</a></p>
+</body>
+</html>
+""")
+
+ANALYSIS_ROW = Template(
+    "<tr><td>$label</td><td>$value $unit</td><td>$score</td>"
+    "<td class=\"$status_class\">$status</td><td>$optimal_range</td></tr>"
+)
+
+RECOMMENDATION = Template("""<div class="recommendation priority-$priority">
+<h4>🔧 $title</h4>
+<p><strong>Öncelik:</strong> $priority_label</p>
+<p>$description</p>
+<ol>$actions</ol>
+</div>""")
+
+INDEX_PAGE = Template("""<!DOCTYPE html>
+<html lang="tr">
+<head>
+<meta charset="utf-8">
+<title>Bölge Raporları</title>
+<link rel="stylesheet" href="assets/report.css">
+</head>
+<body>
+<h1>🏭 Vardiya Sonu Bölge Raporları</h1>
+<p class="meta">$shift</p>
+<table>
+<tr><th>Bölge</th><th>Skor</th><th>Kategori</th><th>Öneri Sayısı</th></tr>
+$rows
+</table>
+</body>
+</html>
+""")
+
+INDEX_ROW = Template(
+    "<tr><td><a href=\"zones/$file\">$zone</a></td><td>$score</td>"
+    "<td style=\"color: $color;\">$category</td><td>$recommendation_count</td></tr>"
+)
+
+STYLESHEET = """body { font-family: sans-serif; margin: 2rem; color: #222; }
+h1 { color: #1f77b4; }
+.meta { color: #666; }
+.score { font-size: 2.5rem; font-weight: bold; text-align: center; padding: 1rem;
+         border-radius: 0.5rem; color: white; width: 12rem; }
+table { border-collapse: collapse; margin: 1rem 0; }
+th, td { border: 1px solid #e0e0e0; padding: 0.4rem 0.8rem; text-align: left; }
+th { background-color: #f0f2f6; }
+.status-ok { color: #2e7d32; }
+.status-bad { color: #c62828; }
+.recommendation { padding: 1rem; border-radius: 0.5rem; border: 1px solid #e0e0e0; margin-bottom: 1rem; }
+.priority-emergency, .priority-critical { border-left: 4px solid #ff4444; background-color: #fff5f5; }
+.priority-high { border-left: 4px solid #ff8800; background-color: #fff8f0; }
+.priority-medium { border-left: 4px solid #ffcc00; background-color: #fffef0; }
+.priority-low { border-left: 4px solid #00cc00; background-color: #f0fff0; }
+svg.trend { border: 1px solid #e0e0e0; background: #fafafa; }
+"""
+
+# Her işçi sürecinde bir kez oluşturulan model
+_worker_model: Optional[AirQualityAI] = None
+
+
+def _init_worker():
+    global _worker_model
+    _worker_model = AirQualityAI()
+
+
+def _safe_filename(zone) -> str:
+    return "".join(ch if ch.isalnum() or ch in '-_' else '_' for ch in str(zone))
+
+
+def _unique_filenames(zones: Sequence) -> List[str]:
+    """
+    Bölgelere dosya adı atar. Güvenli ada dönüşümünde çakışan kimliklere
+    (ör. 'A/1' ve 'A_1') kimliğin özetinden türetilen bir son ek eklenir;
+    büyük/küçük harf duyarsız dosya sistemleri için karşılaştırma harf
+    duyarsızdır.
+    """
+    stems = [_safe_filename(zone) for zone in zones]
+    counts: Dict[str, int] = {}
+    for stem in stems:
+        counts[stem.lower()] = counts.get(stem.lower(), 0) + 1
+
+    used = set()
+    result = []
+    for zone, stem in zip(zones, stems):
+        if counts[stem.lower()] > 1:
+            stem = f"{stem}-{hashlib.sha1(str(zone).encode('utf-8')).hexdigest()[:8]}"
+        candidate, n = stem, 1
+        while candidate.lower() in used:
+            n += 1
+            candidate = f"{stem}-{n}"
+        used.add(candidate.lower())
+        result.append(candidate)
+    return result
+
+
+def _trend_svg(values: Optional[Sequence[float]], width: int = 480, height: int = 120) -> str:
+    """Skor geçmişinden bağımlılıksız satır içi SVG trend grafiği üretir"""
+    if values is None or len(values) < 2:
+        return "<p>Trend verisi yok.</p>"
+
+    n = len(values)
+    points = " ".join(
+        f"{i * (width - 10) / (n - 1) + 5:.1f},{height - 5 - max(0.0, min(1.0, v)) * (height - 10):.1f}"
+        for i, v in enumerate(values)
+    )
+    return (
+        f'<svg class="trend" width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+        f'<polyline fill="none" stroke="#1f77b4" stroke-width="2" points="{points}"/></svg>'
+    )
+
+
+def _render_zone(zone, file_stem: str, inputs: Dict[str, float], trend: Optional[Sequence[float]],
+                 output_dir: str, shift: str, chart_images: bool) -> Dict:
+    """Bir bölgenin HTML ve CSV raporunu yazar, özet satırını döndürür"""
+    missing = [column for column in INPUT_COLUMNS if not math.isfinite(inputs[column])]
+    if missing:
+        # Eksik okumalı bölge, diğer geçersiz okumalar gibi başarısız rapor alır
+        results = {
+            'success': False,
+            'errors': [f"{PARAMETER_LABELS.get(column, column)} değeri eksik" for column in missing],
+            'score': 0,
+            'category': 'Geçersiz',
+            'recommendations': []
+        }
+    else:
+        results = _worker_model.analyze_air_quality(inputs)
+    zone_dir = os.path.join(output_dir, 'zones')
+
+    if not results['success']:
+        rows = "".join(
+            f"<tr><td colspan=\"5\" class=\"status-bad\">{html.escape(error)}</td></tr>"
+            for error in results['errors']
+        )
+        detailed = {}
+        color = '#8b0000'
+        score_text = "-"
+    else:
+        detailed = results['detailed_analysis']
+        color = COLOR_MAP.get(results['color'], '#1f77b4')
+        score_text = f"{results['score'] * 100:.1f}%"
+        rows = "\n".join(
+            ANALYSIS_ROW.substitute(
+                label=PARAMETER_LABELS.get(param, param),
+                value=f"{item['value']:.1f}" if isinstance(item['value'], float) else item['value'],
+                unit=html.escape(item['unit']),
+                score=f"{item['score']:.2f}" if 'score' in item else "-",
+                status=html.escape(item['status']),
+                status_class='status-ok' if item['status'] in ('Optimal', 'Normal') else 'status-bad',
+                optimal_range=html.escape(item['optimal_range'])
+            )
+            for param, item in detailed.items()
+        )
+
+    recommendations = "\n".join(
+        RECOMMENDATION.substitute(
+            priority=rec['priority'],
+            priority_label=rec['priority'].title(),
+            title=html.escape(rec['title']),
+            description=html.escape(rec['description']),
+            actions="".join(f"<li>{html.escape(action)}</li>" for action in rec['actions'])
+        )
+        for rec in results['recommendations']
+    ) or "<p>🎉 İyileştirme önerisi bulunmuyor.</p>"
+
+    trend_html = _trend_svg(trend)
+    if chart_images and trend is not None and len(trend) >= 2:
+        trend_html = _write_chart_image(zone, trend, zone_dir, file_stem)
+
+    page = ZONE_PAGE.substitute(
+        zone=html.escape(str(zone)),
+        shift=html.escape(shift),
+        color=color,
+        score=score_text,
+        category=html.escape(results['category']),
+        rows=rows,
+        trend=trend_html,
+        recommendations=recommendations
+    )
+    with open(os.path.join(zone_dir, f"{file_stem}.html"), 'w', encoding='utf-8') as fh:
+        fh.write(page)
+
+    with open(os.path.join(zone_dir, f"{file_stem}.csv"), 'w', encoding='utf-8', newline='') as fh:
+        writer = csv.writer(fh)
+        writer.writerow(['parametre', 'deger', 'birim', 'skor', 'durum', 'optimal_aralik'])
+        for param, item in detailed.items():
+            writer.writerow([param, item['value'], item['unit'], item.get('score', ''),
+                             item['status'], item['optimal_range']])
+
+    return {
+        'zone': zone,
+        'file': f"{file_stem}.html",
+        'success': results['success'],
+        'score': results['score'],
+        'category': results['category'],
+        'color': color,
+        'recommendation_count': len(results['recommendations']),
+        'top_priority': results['recommendations'][0]['priority'] if results['recommendations'] else ''
+    }
+
+
+def _write_chart_image(zone, trend: Sequence[float], zone_dir: str, file_stem: str) -> str:
+    """Trend grafiğini statik PNG olarak yazar (plotly + kaleido gerektirir)"""
+    import plotly.graph_objects as go
+    try:
+        import kaleido  # noqa: F401
+    except ImportError:
+        raise ImportError("Statik grafik görselleri için 'kaleido' paketi gereklidir: pip install kaleido")
+
+    fig = go.Figure(go.Scatter(y=list(trend), mode='lines', line_color='#1f77b4'))
+    fig.update_layout(title=f"{zone} Skor Trendi", yaxis=dict(range=[0, 1]), width=640, height=240)
+    fig.write_image(os.path.join(zone_dir, f"{file_stem}.png"))
+    return f'<img src="{file_stem}.png" alt="{html.escape(str(zone))} trend">'
+
+
+def _render_chunk(tasks: List[tuple], output_dir: str, shift: str, chart_images: bool) -> List[Dict]:
+    if _worker_model is None:
+        _init_worker()
+    return [_render_zone(zone, file_stem, inputs, trend, output_dir, shift, chart_images)
+            for zone, file_stem, inputs, trend in tasks]
+
+
+class BatchReportGenerator:
+    """
+    Vardiya sonunda tüm bölgeler için HTML/CSV raporları üreten sınıf.
+
+    Şablonlar bir kez derlenir, stil dosyası tüm raporlar arasında paylaşılır
+    ve bölgeler işçi süreçlerinde paralel olarak işlenir.
+    """
+
+    def __init__(self, output_dir: str, workers: Optional[int] = None,
+                 chunk_size: int = 25, chart_images: bool = False):
+        self.output_dir = output_dir
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.chart_images = chart_images
+
+    def _prepare_output(self):
+        os.makedirs(os.path.join(self.output_dir, 'zones'), exist_ok=True)
+        os.makedirs(os.path.join(self.output_dir, 'assets'), exist_ok=True)
+        with open(os.path.join(self.output_dir, 'assets', 'report.css'), 'w', encoding='utf-8') as fh:
+            fh.write(STYLESHEET)
+
+    def generate(self, readings: pd.DataFrame, trends: Optional[Dict[str, Sequence[float]]] = None,
+                 shift: str = "") -> Dict:
+        """
+        Tüm bölgelerin raporlarını üretir.
+
+        readings: bölge kimliği ile indekslenmiş INPUT_COLUMNS sütunları.
+        trends: bölge kimliğinden skor geçmişine (0-1) eşleme.
+        """
+        start = time.perf_counter()
+        self._prepare_output()
+        trends = trends or {}
+        shift = shift or time.strftime("%Y-%m-%d %H:%M")
+
+        tasks = []
+        file_stems = _unique_filenames(list(readings.index))
+        for file_stem, (zone, row) in zip(file_stems, readings[INPUT_COLUMNS].iterrows()):
+            inputs = {column: float(row[column]) for column in INPUT_COLUMNS}
+            if math.isfinite(inputs['occupancy']):
+                inputs['occupancy'] = int(inputs['occupancy'])
+            tasks.append((zone, file_stem, inputs, trends.get(zone)))
+        chunks = [tasks[i:i + self.chunk_size] for i in range(0, len(tasks), self.chunk_size)]
+
+        rows: List[Dict] = []
+        if self.workers > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker) as executor:
+                futures = [
+                    executor.submit(_render_chunk, chunk, self.output_dir, shift, self.chart_images)
+                    for chunk in chunks
+                ]
+                for future in futures:
+                    rows.extend(future.result())
+        else:
+            for chunk in chunks:
+                rows.extend(_render_chunk(chunk, self.output_dir, shift, self.chart_images))
+
+        self._write_index(rows, shift)
+
+        return {
+            'zones': len(rows),
+            'failed': sum(1 for row in rows if not row['success']),
+            'seconds': time.perf_counter() - start,
+            'index': os.path.join(self.output_dir, 'index.html'),
+            'summary_csv': os.path.join(self.output_dir, 'summary.csv')
+        }
+
+    def _write_index(self, rows: List[Dict], shift: str):
+        """Özet sayfasını ve özet CSV dosyasını yazar (en düşük skor önce)"""
+        rows = sorted(rows, key=lambda row: row['score'])
+        index_rows = "\n".join(
+            INDEX_ROW.substitute(
+                file=row['file'],
+                zone=html.escape(str(row['zone'])),
+                score=f"{row['score'] * 100:.1f}%",
+                color=row['color'],
+                category=html.escape(row['category']),
+                recommendation_count=row['recommendation_count']
+            )
+            for row in rows
+        )
+        with open(os.path.join(self.output_dir, 'index.html'), 'w', encoding='utf-8') as fh:
+            fh.write(INDEX_PAGE.substitute(shift=html.escape(shift), rows=index_rows))
+
+        pd.DataFrame(rows, columns=SUMMARY_COLUMNS).to_csv(
+            os.path.join(self.output_dir, 'summary.csv'), index=False, encoding='utf-8'
+        )
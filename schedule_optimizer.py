@@ -0,0 +1,185 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Sequence
+from data_processor import AirQualityDataProcessor
+
+
+class VentilationScheduleOptimizer:
+    """
+    Bölge doluluk planlarından, hava kalitesi skorunu hedefin üzerinde tutan
+    en düşük maliyetli havalandırma ve vardiya planını dinamik programlama ile
+    hesaplayan sınıf.
+
+    CO2 modeli (tam karışımlı tek hacim):
+        dC/dt = N * g / V - ACH * (C - C_dış)
+    Her zaman adımında bir havalandırma seviyesi (ACH) ve doluluk oranı
+    seçilir. Tüm bölgeler aynı anda, CO2 seviyesi ayrık durumlara bölünerek
+    vektörel olarak çözülür.
+    """
+
+    def __init__(self, data_processor: Optional[AirQualityDataProcessor] = None,
+                 ventilation_levels: Sequence[float] = (0.5, 1.0, 2.0, 4.0, 6.0),
+                 shift_levels: Sequence[float] = (1.0, 0.75, 0.5),
+                 ventilation_cost: float = 0.002,
+                 shift_cost: float = 50.0,
+                 step_minutes: int = 5,
+                 co2_limit: float = 1000.0,
+                 outdoor_co2: float = 420.0,
+                 ceiling_height: float = 6.0,
+                 co2_generation: float = 0.0187,
+                 co2_bin_ppm: float = 25.0,
+                 co2_max: float = 3000.0):
+        self.data_processor = data_processor or AirQualityDataProcessor()
+        self.ventilation_levels = np.asarray(ventilation_levels, dtype=float)  # hava değişimi / saat
+        self.shift_levels = np.asarray(shift_levels, dtype=float)              # çalışan doluluk oranı
+        self.ventilation_cost = ventilation_cost  # taşınan m³ hava başına maliyet
+        self.shift_cost = shift_cost              # vardiyaya kaydırılan kişi-saat başına maliyet
+        self.step_minutes = step_minutes
+        self.co2_limit = co2_limit                # recommendations_db'deki 'high' eşiği
+        self.outdoor_co2 = outdoor_co2            # ppm
+        self.ceiling_height = ceiling_height      # m
+        self.co2_generation = co2_generation      # kişi başına m³/saat CO2 (hafif endüstriyel iş)
+        self.co2_bins = np.arange(outdoor_co2, co2_max + co2_bin_ppm, co2_bin_ppm)
+        self.co2_bin_ppm = co2_bin_ppm
+
+        # Hedef altında kalan her adım için ceza (maliyetlerden çok daha büyük)
+        self.violation_penalty = 1e6
+
+    def _actions(self):
+        """(havalandırma, vardiya) eylem çiftlerini düz diziler olarak döndürür"""
+        vent, shift = np.meshgrid(self.ventilation_levels, self.shift_levels, indexing='ij')
+        return vent.ravel(), shift.ravel()
+
+    def _bin_index(self, co2: np.ndarray) -> np.ndarray:
+        """CO2 değerlerini en yakın ayrık durum indeksine çevirir"""
+        idx = np.rint((co2 - self.co2_bins[0]) / self.co2_bin_ppm).astype(np.int64)
+        return np.clip(idx, 0, len(self.co2_bins) - 1)
+
+    def _static_scores(self, zones: pd.DataFrame, occupancy: np.ndarray, shift: np.ndarray):
+        """
+        Skorun CO2'den bağımsız kısımlarını hesaplar.
+
+        calculate_air_quality_score ağırlıklı ortalama olduğundan skor,
+        sıcaklık/nem, CO2 ve kişi başına alan katkılarının toplamıdır.
+        """
+        processor = self.data_processor
+        weights = processor.weights
+        total_weight = sum(weights.values())
+        ref = processor.reference_values
+
+        def component(param, values, reverse=False):
+            r = ref[param]
+            return processor._normalize_array(values, r['min'], r['max'], r['optimal'], reverse) \
+                * weights[param] / total_weight
+
+        climate = (
+            component('temperature', zones['temperature'].to_numpy(dtype=float))
+            + component('humidity', zones['humidity'].to_numpy(dtype=float))
+        )
+
+        # Kişi başına alan: (bölge, adım, eylem)
+        area = zones['area'].to_numpy(dtype=float)[:, None, None]
+        people = occupancy[:, :, None] * shift[None, None, :]
+        area_per_person = np.where(people <= 0, area, area / np.where(people <= 0, 1, people))
+        area_component = component('area_per_person', area_per_person)
+
+        co2_component = component('co2', self.co2_bins, reverse=True)
+        return climate, area_component, co2_component
+
+    def optimize(self, zones: pd.DataFrame, occupancy: np.ndarray,
+                 target_score: float = 0.6) -> Dict:
+        """
+        Tüm bölgeler için günlük planı hesaplar.
+
+        zones: bölge kimliği ile indekslenmiş 'area', 'temperature',
+        'humidity' ve 'co2' (başlangıç değeri) sütunları.
+        occupancy: (bölge sayısı, adım sayısı) boyutlu planlanan çalışan sayısı;
+        5 dakikalık adımlarla bir gün 288 adımdır.
+        """
+        occupancy = np.asarray(occupancy, dtype=float)
+        n_zones, n_steps = occupancy.shape
+        if n_zones != len(zones):
+            raise ValueError("Doluluk planı satır sayısı bölge sayısı ile aynı olmalıdır")
+
+        vent, shift = self._actions()
+        n_actions = len(vent)
+        dt_hours = self.step_minutes / 60.0
+        volume = zones['area'].to_numpy(dtype=float) * self.ceiling_height
+
+        climate, area_component, co2_component = self._static_scores(zones, occupancy, shift)
+
+        # Kararlı durum CO2 seviyesi ve adım başına sönüm: (bölge, adım, eylem)
+        people = occupancy[:, :, None] * shift[None, None, :]
+        steady = self.outdoor_co2 + people * self.co2_generation * 1e6 / (vent * volume[:, None, None])
+        decay = np.exp(-vent * dt_hours)
+
+        # Adım maliyeti: taşınan hava hacmi + kaydırılan kişi-saat
+        cost = (
+            self.ventilation_cost * (vent * volume[:, None])[:, None, :] * dt_hours
+            + self.shift_cost * (occupancy[:, :, None] * (1 - shift)) * dt_hours
+        )
+
+        # Geriye doğru dinamik programlama
+        n_bins = len(self.co2_bins)
+        value = np.zeros((n_zones, n_bins))
+        policy = np.empty((n_steps, n_zones, n_bins), dtype=np.int16)
+        bins = self.co2_bins[None, :]
+
+        for t in range(n_steps - 1, -1, -1):
+            best = np.full((n_zones, n_bins), np.inf)
+            best_action = np.zeros((n_zones, n_bins), dtype=np.int16)
+            for a in range(n_actions):
+                next_co2 = steady[:, t, a, None] + (bins - steady[:, t, a, None]) * decay[a]
+                next_idx = self._bin_index(next_co2)
+
+                score = climate[:, None] + area_component[:, t, a, None] + co2_component[next_idx]
+                # Ayrıklaştırma hatası için yarım aralık güvenlik payı
+                violation = (score < target_score) | (next_co2 + self.co2_bin_ppm / 2 > self.co2_limit)
+
+                q = cost[:, t, a, None] + violation * self.violation_penalty \
+                    + np.take_along_axis(value, next_idx, axis=1)
+                better = q < best
+                best = np.where(better, q, best)
+                best_action = np.where(better, a, best_action)
+            value = best
+            policy[t] = best_action
+
+        # İleriye doğru simülasyon (sürekli CO2 değeri ile)
+        zone_range = np.arange(n_zones)
+        co2 = zones['co2'].to_numpy(dtype=float).copy()
+        plan_vent = np.empty((n_zones, n_steps))
+        plan_shift = np.empty((n_zones, n_steps))
+        plan_co2 = np.empty((n_zones, n_steps))
+        plan_score = np.empty((n_zones, n_steps))
+        plan_cost = np.empty((n_zones, n_steps))
+
+        ref = self.data_processor.reference_values['co2']
+        co2_weight = self.data_processor.weights['co2'] / sum(self.data_processor.weights.values())
+        for t in range(n_steps):
+            action = policy[t, zone_range, self._bin_index(co2)]
+            s = steady[zone_range, t, action]
+            co2 = s + (co2 - s) * decay[action]
+
+            plan_vent[:, t] = vent[action]
+            plan_shift[:, t] = shift[action]
+            plan_co2[:, t] = co2
+            plan_score[:, t] = climate + area_component[zone_range, t, action] + co2_weight * \
+                self.data_processor._normalize_array(co2, ref['min'], ref['max'], ref['optimal'], reverse=True)
+            plan_cost[:, t] = cost[zone_range, t, action]
+
+        violations = (plan_score < target_score) | (plan_co2 > self.co2_limit)
+        columns = pd.RangeIndex(n_steps, name='step')
+
+        def frame(values):
+            return pd.DataFrame(values, index=zones.index, columns=columns)
+
+        return {
+            'ventilation': frame(plan_vent),
+            'occupancy_fraction': frame(plan_shift),
+            'co2': frame(plan_co2),
+            'score': frame(plan_score),
+            'cost': frame(plan_cost),
+            'total_cost': float(plan_cost.sum()),
+            'violations': frame(violations),
+            'feasible': not violations.any()
+        }
@@ -0,0 +1,269 @@
+import time
+import numpy as np
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+# Temizleme bayrakları (bit maskesi)
+FLAG_OK = 0
+FLAG_OUTLIER = 1   # Hampel filtresi ile değiştirildi
+FLAG_STUCK = 2     # Sensör donmuş (uzun süre aynı değer), değer geçersiz sayıldı
+FLAG_FILLED = 4    # Eksik değer kayan medyan ile dolduruldu
+FLAG_MISSING = 8   # Boşluk sınırı aşıldı, değer yok (NaN)
+
+
+class StreamingSensorCleaner:
+    """
+    Ham sensör akışlarını normalizasyondan önce temizleyen sınıf.
+
+    Her sensör için sabit boyutlu durum tutulur (kayan pencere, son değer,
+    tekrar ve boşluk sayaçları). Veriler "tick" halinde, yani her sensörden
+    en fazla bir okuma içeren NumPy dizileri olarak işlenir; böylece binlerce
+    sensör tek bir vektörel adımda temizlenir.
+    """
+
+    def __init__(self, parameters: Sequence[str] = ('temperature', 'humidity', 'co2'),
+                 window: int = 7, n_sigmas: float = 3.0, stuck_limit: int = 30,
+                 stuck_seconds: float = 6 * 3600, max_gap: int = 5, min_samples: int = 3,
+                 initial_capacity: int = 1024):
+        self.parameters = tuple(parameters)
+        self.window = window
+        # Hampel kontrolü için parametre penceresinde gereken asgari geçerli okuma
+        self.min_samples = min(min_samples, window)
+        self.n_sigmas = n_sigmas
+        # Donmuş sensör: en az stuck_limit okuma boyunca ve stuck_seconds
+        # süresince aynı ham değer. Klima kontrollü alanlarda düşük çözünürlüklü
+        # sensörler saatlerce aynı değeri okuyabildiği için tek başına okuma
+        # sayısı yeterli değildir.
+        self.stuck_limit = stuck_limit
+        self.stuck_seconds = stuck_seconds
+        self.max_gap = max_gap
+
+        # MAD sıfır olduğunda her küçük değişimin aykırı sayılmaması için
+        # parametre bazında asgari sapma eşikleri
+        self.min_deviation = {
+            'temperature': 0.5,   # °C
+            'humidity': 2.0,      # %
+            'co2': 50.0           # ppm
+        }
+
+        self._sensor_index: Dict[Hashable, int] = {}
+        self._allocate(initial_capacity)
+
+    def _allocate(self, capacity: int):
+        """Sensör durum dizilerini ayırır"""
+        n_params = len(self.parameters)
+        self._capacity = capacity
+        self._windows = np.full((capacity, n_params, self.window), np.nan)
+        self._pos = np.zeros(capacity, dtype=np.int64)
+        self._count = np.zeros(capacity, dtype=np.int64)
+        self._last_raw = np.full((capacity, n_params), np.nan)
+        self._repeat = np.zeros((capacity, n_params), dtype=np.int64)
+        self._same_since = np.full((capacity, n_params), np.nan)
+        self._gap = np.zeros((capacity, n_params), dtype=np.int64)
+
+    def _grow(self, capacity: int):
+        """Kapasiteyi artırır, mevcut durumu korur"""
+        old = (self._windows, self._pos, self._count, self._last_raw, self._repeat, self._gap, self._same_since)
+        n = self._capacity
+        self._allocate(capacity)
+        self._windows[:n] = old[0]
+        self._pos[:n] = old[1]
+        self._count[:n] = old[2]
+        self._last_raw[:n] = old[3]
+        self._repeat[:n] = old[4]
+        self._gap[:n] = old[5]
+        self._same_since[:n] = old[6]
+
+    def sensor_indices(self, sensor_ids: Sequence[Hashable]) -> np.ndarray:
+        """Sensör kimliklerini iç dizi indekslerine çevirir, yeni sensörleri kaydeder"""
+        index = self._sensor_index
+        result = np.empty(len(sensor_ids), dtype=np.int64)
+        for i, sensor_id in enumerate(sensor_ids):
+            idx = index.get(sensor_id)
+            if idx is None:
+                idx = len(index)
+                index[sensor_id] = idx
+            result[i] = idx
+
+        if len(index) > self._capacity:
+            self._grow(max(len(index), self._capacity * 2))
+        return result
+
+    def clean_tick(self, sensor_ids: Sequence[Hashable], values: np.ndarray,
+                   timestamps: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Bir tick içindeki okumaları temizler.
+
+        values: (n, parametre sayısı) boyutlu dizi, eksik değerler NaN.
+        timestamps: okuma zamanları (sn); verilmezse şimdiki zaman kullanılır.
+        Her sensör kimliği tick içinde en fazla bir kez bulunmalıdır.
+        Temizlenmiş değerleri ve aynı boyutta bayrak dizisini döndürür.
+        """
+        values = np.asarray(values, dtype=float)
+        if values.ndim != 2 or values.shape[1] != len(self.parameters):
+            raise ValueError("values (n, %d) boyutunda olmalıdır" % len(self.parameters))
+
+        idx = self.sensor_indices(sensor_ids)
+        if len(np.unique(idx)) != len(idx):
+            raise ValueError("Bir tick içinde aynı sensörden birden fazla okuma olamaz")
+
+        windows = self._windows[idx]
+        count = self._count[idx]
+        cleaned = values.copy()
+        flags = np.zeros(values.shape, dtype=np.uint8)
+
+        # Kayan medyan ve MAD; eksik okumalar pencerede NaN kalabildiği için
+        # Hampel kontrolü her parametrenin geçerli okuma sayısına göre açılır
+        valid_count = (~np.isnan(windows)).sum(axis=2)
+        warm = valid_count >= self.min_samples
+        median = np.full(values.shape, np.nan)
+        mad = np.zeros(values.shape)
+        full = valid_count == self.window
+        partial = (valid_count > 0) & ~full
+        if full.any():
+            median[full] = np.median(windows[full], axis=1)
+            mad[full] = np.median(np.abs(windows[full] - median[full][:, None]), axis=1)
+        if partial.any():
+            median[partial] = np.nanmedian(windows[partial], axis=1)
+            mad[partial] = np.nanmedian(np.abs(windows[partial] - median[partial][:, None]), axis=1)
+
+        missing = np.isnan(values)
+        present = ~missing
+
+        # Donmuş sensör tespiti: aynı ham değerin hem okuma sayısı hem süre
+        # olarak uzun süre tekrarı
+        if timestamps is None:
+            timestamps = np.full(len(idx), time.time())
+        timestamps = np.asarray(timestamps, dtype=float)[:, None]
+        last_raw = self._last_raw[idx]
+        same = present & (values == last_raw)
+        repeat = np.where(same, self._repeat[idx] + 1, 0)
+        same_since = np.where(same, self._same_since[idx], timestamps)
+        same_since = np.where(present, same_since, self._same_since[idx])
+        stuck = (repeat >= self.stuck_limit) & (timestamps - same_since >= self.stuck_seconds)
+
+        # Hampel filtresi
+        min_dev = np.array([self.min_deviation.get(p, 0.0) for p in self.parameters])
+        threshold = np.maximum(self.n_sigmas * 1.4826 * mad, min_dev)
+        with np.errstate(invalid='ignore'):
+            outlier = present & warm & (np.abs(values - median) > threshold) & ~stuck
+        cleaned[outlier] = median[outlier]
+        flags[outlier] |= FLAG_OUTLIER
+
+        cleaned[stuck] = np.nan
+        flags[stuck] |= FLAG_STUCK
+
+        # Sınırlı boşluk doldurma: eksik değer kayan medyan ile tamamlanır
+        gap = np.where(missing, self._gap[idx] + 1, 0)
+        fillable = missing & (gap <= self.max_gap) & ~np.isnan(median)
+        cleaned[fillable] = median[fillable]
+        flags[fillable] |= FLAG_FILLED
+        flags[missing & ~fillable] |= FLAG_MISSING
+
+        # Durumu güncelle: ham değerler pencereye yazılır, böylece kalıcı
+        # seviye değişimleri pencere yarısı kadar okuma sonra kabul edilir
+        pos = self._pos[idx]
+        new_entries = np.where(present & ~stuck, values, windows[np.arange(len(idx)), :, pos])
+        windows[np.arange(len(idx)), :, pos] = new_entries
+        self._windows[idx] = windows
+        self._pos[idx] = (pos + 1) % self.window
+        self._count[idx] = count + 1
+        self._last_raw[idx] = np.where(present, values, last_raw)
+        self._repeat[idx] = repeat
+        self._same_since[idx] = same_since
+        self._gap[idx] = gap
+
+        return cleaned, flags
+
+    def clean_batch(self, sensor_ids: Sequence[Hashable], values: np.ndarray,
+                    timestamps: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Aynı sensörden birden fazla okuma içerebilen bir toplu veriyi
+        sıralamayı koruyarak tick'lere bölüp temizler.
+        """
+        values = np.asarray(values, dtype=float)
+        if timestamps is None:
+            timestamps = np.full(len(values), time.time())
+        timestamps = np.asarray(timestamps, dtype=float)
+        idx = self.sensor_indices(sensor_ids)
+
+        # Her okumanın kendi sensörü içindeki sırası (0, 1, 2, ...)
+        order = np.argsort(idx, kind='stable')
+        sorted_idx = idx[order]
+        starts = np.r_[0, np.flatnonzero(np.diff(sorted_idx)) + 1]
+        rank_sorted = np.arange(len(idx)) - np.repeat(starts, np.diff(np.r_[starts, len(idx)]))
+        rank = np.empty(len(idx), dtype=np.int64)
+        rank[order] = rank_sorted
+
+        sensor_ids = np.asarray(sensor_ids, dtype=object)
+        cleaned = np.empty(values.shape)
+        flags = np.empty(values.shape, dtype=np.uint8)
+        for r in range(int(rank.max()) + 1 if len(rank) else 0):
+            rows = np.flatnonzero(rank == r)
+            cleaned[rows], flags[rows] = self.clean_tick(sensor_ids[rows], values[rows], timestamps[rows])
+        return cleaned, flags
+
+    def clean_reading(self, sensor_id: Hashable, reading: Dict[str, float],
+                      timestamp: Optional[float] = None) -> Tuple[Dict[str, float], List[str]]:
+        """
+        Tek bir okuma sözlüğünü temizler.
+
+        Temizlenmiş sözlüğü ve uygulanan düzeltmelerin açıklamalarını döndürür;
+        'area' ve 'occupancy' gibi sensör dışı alanlar olduğu gibi aktarılır.
+        """
+        row = np.array([[reading.get(p, np.nan) if reading.get(p) is not None else np.nan
+                         for p in self.parameters]], dtype=float)
+        cleaned, flags = self.clean_tick([sensor_id], row, None if timestamp is None else [timestamp])
+
+        result = dict(reading)
+        notes = []
+        for j, param in enumerate(self.parameters):
+            result[param] = float(cleaned[0, j])
+            flag = flags[0, j]
+            if flag & FLAG_OUTLIER:
+                notes.append(f"{param}: aykırı değer kayan medyan ile değiştirildi")
+            if flag & FLAG_STUCK:
+                notes.append(f"{param}: sensör donmuş görünüyor")
+            if flag & FLAG_FILLED:
+                notes.append(f"{param}: eksik değer dolduruldu")
+            if flag & FLAG_MISSING:
+                notes.append(f"{param}: değer eksik")
+        return result, notes
+
+    def reset(self, sensor_id: Hashable):
+        """Bir sensörün durumunu sıfırlar (ör. bakım veya kalibrasyon sonrası)"""
+        idx = self._sensor_index.get(sensor_id)
+        if idx is None:
+            return
+        self._windows[idx] = np.nan
+        self._pos[idx] = 0
+        self._count[idx] = 0
+        self._last_raw[idx] = np.nan
+        self._repeat[idx] = 0
+        self._same_since[idx] = np.nan
+        self._gap[idx] = 0
+
+
+if __name__ == "__main__":
+    # Isınma sırasında eksik kalan parametrede aykırı değer yine yakalanmalı
+    cleaner = StreamingSensorCleaner()
+    for _ in range(7):
+        cleaner.clean_reading('s1', {'temperature': 22.0, 'humidity': 45.0, 'co2': None})
+    for co2 in (650.0, 660.0, 655.0):
+        cleaner.clean_reading('s1', {'temperature': 22.0, 'humidity': 45.0, 'co2': co2})
+    reading, notes = cleaner.clean_reading('s1', {'temperature': 22.0, 'humidity': 45.0, 'co2': 5000.0})
+    assert reading['co2'] == 655.0, reading
+    assert notes == ["co2: aykırı değer kayan medyan ile değiştirildi"], notes
+    print("Isınma sırasında eksik parametre kontrolü: OK")
+
+    # Kararlı değer okuyan sağlam sensör kısa sürede donmuş sayılmamalı,
+    # aynı değeri saatlerce gönderen sensör ise sayılmalı
+    cleaner = StreamingSensorCleaner()
+    for k in range(60):
+        reading, notes = cleaner.clean_reading('s2', {'temperature': 22.0, 'humidity': 45.0, 'co2': 650.0},
+                                               timestamp=k * 5.0)
+    assert notes == [], notes
+    for k in range(60):
+        reading, notes = cleaner.clean_reading('s2', {'temperature': 22.0, 'humidity': 45.0, 'co2': 650.0},
+                                               timestamp=7 * 3600 + k * 5.0)
+    assert "temperature: sensör donmuş görünüyor" in notes, notes
+    print("Donmuş sensör kontrolü: OK")
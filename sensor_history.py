@@ -0,0 +1,265 @@
+import json
+import os
+import sys
+import time
+import numpy as np
+from typing import Dict, Hashable, Optional, Sequence
+
+HISTORY_PARAMETERS = ('temperature', 'humidity', 'co2')
+
+
+class SensorHistoryBuffer:
+    """
+    Sensör başına son N okumayı önceden ayrılmış NumPy halka tamponlarında
+    tutan sınıf.
+
+    Her değer tamponda iki kez (i ve i + N konumlarına) yazılır; böylece son
+    n okuma her zaman bitişik bir dilimdir ve kopyalanmadan görünüm olarak
+    döndürülebilir. Ekleme O(1)'dir.
+
+    storage_dir verilirse tamponlar bellek eşlemeli dosyalarda tutulur; yazan
+    süreç yerinde günceller, diğer süreçler attach ile salt okunur bağlanır.
+    """
+
+    def __init__(self, max_sensors: int, capacity: int = 720,
+                 parameters: Sequence[str] = HISTORY_PARAMETERS,
+                 dtype=np.float32, storage_dir: Optional[str] = None):
+        self.max_sensors = max_sensors
+        self.capacity = capacity
+        self.parameters = tuple(parameters)
+        self.dtype = np.dtype(dtype)
+        self.storage_dir = storage_dir
+        self.read_only = False
+
+        self._sensor_index: Dict[Hashable, int] = {}
+        if storage_dir:
+            os.makedirs(storage_dir, exist_ok=True)
+            with open(os.path.join(storage_dir, 'layout.json'), 'w', encoding='utf-8') as fh:
+                json.dump({
+                    'max_sensors': max_sensors,
+                    'capacity': capacity,
+                    'parameters': list(self.parameters),
+                    'dtype': self.dtype.str
+                }, fh)
+
+        self.values = {
+            param: self._allocate(f"values_{param}", (max_sensors, 2 * capacity), self.dtype, np.nan)
+            for param in self.parameters
+        }
+        self.timestamps = self._allocate('timestamps', (max_sensors, 2 * capacity), np.float64, 0)
+        self.position = self._allocate('position', (max_sensors,), np.int64, 0)
+        self.count = self._allocate('count', (max_sensors,), np.int64, 0)
+
+    def _allocate(self, name: str, shape, dtype, fill) -> np.ndarray:
+        """Bellekte veya storage_dir altında bellek eşlemeli dizi ayırır"""
+        if not self.storage_dir:
+            return np.full(shape, fill, dtype=dtype)
+        array = np.lib.format.open_memmap(
+            os.path.join(self.storage_dir, f"{name}.npy"), mode='w+', dtype=dtype, shape=shape
+        )
+        array[...] = fill
+        return array
+
+    @classmethod
+    def attach(cls, storage_dir: str) -> 'SensorHistoryBuffer':
+        """Başka bir sürecin yazdığı tamponlara salt okunur olarak bağlanır"""
+        with open(os.path.join(storage_dir, 'layout.json'), 'r', encoding='utf-8') as fh:
+            layout = json.load(fh)
+
+        buffer = cls.__new__(cls)
+        buffer.max_sensors = layout['max_sensors']
+        buffer.capacity = layout['capacity']
+        buffer.parameters = tuple(layout['parameters'])
+        buffer.dtype = np.dtype(layout['dtype'])
+        buffer.storage_dir = storage_dir
+        buffer.read_only = True
+        buffer._sensor_index = {}
+
+        def load(name):
+            return np.load(os.path.join(storage_dir, f"{name}.npy"), mmap_mode='r')
+
+        buffer.values = {param: load(f"values_{param}") for param in buffer.parameters}
+        buffer.timestamps = load('timestamps')
+        buffer.position = load('position')
+        buffer.count = load('count')
+        buffer._load_sensor_index()
+        return buffer
+
+    def sync_sensor_index(self):
+        """Sensör kimliği eşlemesini okuyucu süreçler için diske yazar"""
+        if not self.storage_dir or self.read_only:
+            return
+        path = os.path.join(self.storage_dir, 'sensors.json')
+        with open(path + '.tmp', 'w', encoding='utf-8') as fh:
+            json.dump(list(self._sensor_index.items()), fh, default=str)
+        os.replace(path + '.tmp', path)
+
+    def _load_sensor_index(self):
+        path = os.path.join(self.storage_dir, 'sensors.json')
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as fh:
+                self._sensor_index = {sensor_id: idx for sensor_id, idx in json.load(fh)}
+
+    def sensor_index(self, sensor_id: Hashable) -> int:
+        """Sensör kimliğinin tampon satırını döndürür, yeni sensörü kaydeder"""
+        idx = self._sensor_index.get(sensor_id)
+        if idx is None:
+            if self.read_only:
+                raise ValueError("Salt okunur tampona yazılamaz")
+            idx = len(self._sensor_index)
+            if idx >= self.max_sensors:
+                raise ValueError(f"Sensör kapasitesi doldu ({self.max_sensors})")
+            self._sensor_index[sensor_id] = idx
+        return idx
+
+    def append(self, sensor_id: Hashable, reading: Dict[str, float],
+               timestamp: Optional[float] = None):
+        """Bir sensörün okumasını ekler"""
+        idx = self.sensor_index(sensor_id)
+        pos = self.position[idx]
+        mirror = pos + self.capacity
+
+        for param in self.parameters:
+            value = reading.get(param)
+            value = np.nan if value is None else value
+            row = self.values[param][idx]
+            row[pos] = value
+            row[mirror] = value
+
+        ts = time.time() if timestamp is None else timestamp
+        self.timestamps[idx, pos] = ts
+        self.timestamps[idx, mirror] = ts
+
+        self.position[idx] = (pos + 1) % self.capacity
+        self.count[idx] += 1
+
+    def append_batch(self, sensor_ids: Sequence[Hashable], values: np.ndarray,
+                     timestamps: Optional[np.ndarray] = None):
+        """
+        Birçok sensörün okumasını tek adımda ekler.
+
+        values: (n, parametre sayısı) boyutlu dizi; her sensör kimliği en
+        fazla bir kez bulunmalıdır.
+        """
+        idx = np.fromiter((self.sensor_index(s) for s in sensor_ids), dtype=np.int64, count=len(sensor_ids))
+        values = np.asarray(values, dtype=self.dtype)
+        if timestamps is None:
+            timestamps = np.full(len(idx), time.time())
+
+        pos = self.position[idx]
+        mirror = pos + self.capacity
+        for j, param in enumerate(self.parameters):
+            self.values[param][idx, pos] = values[:, j]
+            self.values[param][idx, mirror] = values[:, j]
+        self.timestamps[idx, pos] = timestamps
+        self.timestamps[idx, mirror] = timestamps
+
+        self.position[idx] = (pos + 1) % self.capacity
+        self.count[idx] += 1
+
+    def _lookup(self, sensor_id: Hashable) -> int:
+        """Okuma için sensör satırını bulur; okuyucu süreçte eşlemeyi tazeler"""
+        if sensor_id not in self._sensor_index and self.read_only:
+            self._load_sensor_index()
+        return self._sensor_index[sensor_id]
+
+    def window(self, sensor_id: Hashable, parameter: str, n: Optional[int] = None) -> np.ndarray:
+        """
+        Bir sensörün son n okumasını eskiden yeniye döndürür.
+
+        Dönen dizi tamponun kopyasız görünümüdür; sonraki eklemelerde içeriği
+        değişebileceği için saklanacaksa kopyalanmalıdır.
+        """
+        idx = self._lookup(sensor_id)
+        available = int(min(self.count[idx], self.capacity))
+        n = available if n is None else min(n, available)
+        end = self.position[idx] + self.capacity
+        return self.values[parameter][idx, end - n:end]
+
+    def timestamp_window(self, sensor_id: Hashable, n: Optional[int] = None) -> np.ndarray:
+        """window ile aynı aralığın zaman damgalarını döndürür"""
+        idx = self._lookup(sensor_id)
+        available = int(min(self.count[idx], self.capacity))
+        n = available if n is None else min(n, available)
+        end = self.position[idx] + self.capacity
+        return self.timestamps[idx, end - n:end]
+
+    def latest(self, parameter: str) -> np.ndarray:
+        """Tüm kayıtlı sensörlerin son değerini döndürür"""
+        n = len(self._sensor_index)
+        rows = np.arange(n)
+        return self.values[parameter][rows, self.position[:n] + self.capacity - 1]
+
+    def nbytes(self) -> int:
+        """Tamponların kapladığı toplam bellek (bayt)"""
+        return (
+            sum(array.nbytes for array in self.values.values())
+            + self.timestamps.nbytes + self.position.nbytes + self.count.nbytes
+        )
+
+
+def _deep_sizeof(obj) -> int:
+    """Liste/sözlük yapılarının yaklaşık toplam belleğini hesaplar"""
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return total
+
+
+def benchmark_memory(n_sensors: int = 100, readings_per_hour: int = 720) -> Dict[str, float]:
+    """
+    Sensör-saat başına belleği halka tampon ile sözlük listesi yaklaşımında
+    karşılaştırır (varsayılan: 5 saniyede bir okuma).
+    """
+    rng = np.random.default_rng(0)
+    values = np.column_stack([
+        rng.normal(22, 1, (n_sensors * readings_per_hour)),
+        rng.normal(45, 5, (n_sensors * readings_per_hour)),
+        rng.normal(700, 100, (n_sensors * readings_per_hour))
+    ])
+
+    # analyze_air_quality girdi biçimindeki sözlük listeleri
+    history = {}
+    for i, row in enumerate(values):
+        history.setdefault(i % n_sensors, []).append({
+            'temperature': float(row[0]),
+            'humidity': float(row[1]),
+            'co2': float(row[2]),
+            'timestamp': 1_700_000_000.0 + i
+        })
+    dict_bytes = _deep_sizeof(history)
+
+    buffer = SensorHistoryBuffer(n_sensors, capacity=readings_per_hour)
+    sensor_ids = np.arange(n_sensors)
+    start = time.perf_counter()
+    for k in range(readings_per_hour):
+        buffer.append_batch(sensor_ids, values[k * n_sensors:(k + 1) * n_sensors])
+    append_seconds = time.perf_counter() - start
+    ring_bytes = buffer.nbytes()
+
+    sensor_hours = n_sensors
+    return {
+        'dict_bytes_per_sensor_hour': dict_bytes / sensor_hours,
+        'ring_bytes_per_sensor_hour': ring_bytes / sensor_hours,
+        'ratio': dict_bytes / ring_bytes,
+        'ring_appends_per_second': n_sensors * readings_per_hour / append_seconds
+    }
+
+
+if __name__ == "__main__":
+    results = benchmark_memory()
+    print(f"Sözlük listesi : {results['dict_bytes_per_sensor_hour'] / 1024:.1f} KB / sensör-saat")
+    print(f"Halka tampon   : {results['ring_bytes_per_sensor_hour'] / 1024:.1f} KB / sensör-saat")
+    print(f"Oran           : {results['ratio']:.1f}x")
+    print(f"Ekleme hızı    : {results['ring_appends_per_second']:,.0f} okuma/sn")
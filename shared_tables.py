@@ -0,0 +1,148 @@
+import errno
+import json
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+import numpy as np
+from typing import Callable, Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: kilit yok, yayınlama yine de yarışa dayanıklıdır
+    fcntl = None
+
+SHARED_TABLES_ENV = 'HAVA_SHARED_TABLES_DIR'
+
+
+class SharedTableStore:
+    """
+    Önceden hesaplanmış NumPy tablolarını bellek eşlemeli (.npy) dosyalar
+    olarak yayınlayan ve diğer süreçlerin salt okunur olarak bağlanmasını
+    sağlayan sınıf.
+
+    Aynı makinedeki tüm Streamlit süreçleri tabloları işletim sisteminin
+    sayfa önbelleği üzerinden paylaşır; bağlanmak tabloları yeniden
+    oluşturmak yerine yalnızca dosyaları eşlemektir.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def from_environment(cls) -> Optional['SharedTableStore']:
+        """HAVA_SHARED_TABLES_DIR tanımlıysa bir depo döndürür"""
+        directory = os.environ.get(SHARED_TABLES_ENV)
+        return cls(directory) if directory else None
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    @contextmanager
+    def _locked(self, name: str, shared: bool = False):
+        """Aynı tablo kümesi için süreçler arası kilit (fcntl.flock)"""
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.directory, f".{name}.lock"), 'a') as fh:
+            fcntl.flock(fh, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def _stage(self, name: str, arrays: Dict[str, np.ndarray], metadata: Optional[Dict]) -> str:
+        """Tablo kümesini geçici bir dizine yazar ve dizin yolunu döndürür"""
+        staging = tempfile.mkdtemp(prefix=f".{name}-", dir=self.directory)
+        try:
+            for key, array in arrays.items():
+                np.save(os.path.join(staging, f"{key}.npy"), np.ascontiguousarray(array))
+            with open(os.path.join(staging, 'manifest.json'), 'w', encoding='utf-8') as fh:
+                json.dump({
+                    'arrays': sorted(arrays),
+                    'metadata': metadata or {},
+                    'published_at': time.time()
+                }, fh, ensure_ascii=False)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        return staging
+
+    def _install(self, name: str, staging: str, replace: bool):
+        """Hazırlanan dizini yerine taşır; çağıran kilidi tutmalıdır"""
+        target = self._path(name)
+        try:
+            if os.path.exists(target) and replace:
+                # Eski küme açık eşlemeler için silinmeden önce kenara alınır
+                retired = tempfile.mkdtemp(prefix=f".{name}-old-", dir=self.directory)
+                os.rename(target, os.path.join(retired, name))
+                os.rename(staging, target)
+                shutil.rmtree(retired, ignore_errors=True)
+                return
+            try:
+                os.rename(staging, target)
+            except OSError as exc:
+                # Hedef bu arada başka bir süreç tarafından oluşturulduysa
+                # (ör. kilitsiz platformlarda) yayın başarılı sayılır
+                if exc.errno not in (errno.EEXIST, errno.ENOTEMPTY) or not self.exists(name):
+                    raise
+                shutil.rmtree(staging, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    def publish(self, name: str, arrays: Dict[str, np.ndarray], metadata: Optional[Dict] = None,
+                replace: bool = True):
+        """
+        Tablo kümesini yayınlar.
+
+        Dosyalar önce geçici bir dizine yazılır ve tek adımda yerine taşınır;
+        böylece okuyucular hiçbir zaman yarım yazılmış bir küme görmez.
+        replace=False ise bu arada başka bir sürecin yayınladığı küme korunur.
+        """
+        staging = self._stage(name, arrays, metadata)
+        with self._locked(name):
+            self._install(name, staging, replace)
+
+    def attach_or_publish(self, name: str, build: Callable[[], Tuple[Dict[str, np.ndarray], Dict]],
+                          metadata_check: Optional[Callable[[Dict], bool]] = None) -> Dict:
+        """
+        Tablo kümesine bağlanır; küme yoksa veya metadata_check onu reddederse
+        build() ile oluşturup yayınlar.
+
+        Kontrol ve oluşturma aynı kilit altında yapılır; aynı anda başlayan
+        süreçlerden yalnızca biri tabloları hesaplar, diğerleri bekleyip bağlanır.
+        """
+        with self._locked(name):
+            if self.exists(name):
+                tables = self._attach(name)
+                if metadata_check is None or metadata_check(tables['metadata']):
+                    return tables
+            arrays, metadata = build()
+            self._install(name, self._stage(name, arrays, metadata), replace=True)
+            return self._attach(name)
+
+    def exists(self, name: str) -> bool:
+        return os.path.exists(os.path.join(self._path(name), 'manifest.json'))
+
+    def attach(self, name: str) -> Dict:
+        """
+        Yayınlanmış tablo kümesine salt okunur olarak bağlanır.
+
+        {'arrays': {ad: bellek eşlemeli dizi}, 'metadata': {...}} döndürür.
+        """
+        with self._locked(name, shared=True):
+            return self._attach(name)
+
+    def _attach(self, name: str) -> Dict:
+        path = self._path(name)
+        with open(os.path.join(path, 'manifest.json'), 'r', encoding='utf-8') as fh:
+            manifest = json.load(fh)
+
+        arrays = {
+            key: np.load(os.path.join(path, f"{key}.npy"), mmap_mode='r')
+            for key in manifest['arrays']
+        }
+        return {'arrays': arrays, 'metadata': manifest['metadata']}
@@ -0,0 +1,292 @@
+import hashlib
+import inspect
+import json
+import threading
+import time
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.neighbors import KDTree
+from typing import Callable, Dict, Hashable, Optional, Sequence, Tuple
+from data_processor import AirQualityDataProcessor
+
+SPATIAL_PARAMETERS = ['temperature', 'humidity', 'co2', 'score']
+
+
+def _safe_name(value) -> str:
+    return "".join(ch if ch.isalnum() or ch in '-_' else '_' for ch in str(value))
+
+
+class FloorLayout:
+    """
+    Bir üretim katındaki sensör konumları için ters mesafe ağırlıklı (IDW)
+    enterpolasyon ağırlıklarını önceden hesaplayan sınıf.
+
+    Ağırlıklar (ızgara hücresi x sensör) boyutlu seyrek bir matris olarak
+    saklanır; yeni okumalarla ızgarayı yenilemek tek bir matris-vektör
+    çarpımıdır.
+    """
+
+    def __init__(self, sensor_positions: np.ndarray, width: float, height: float,
+                 grid_shape: Tuple[int, int] = (500, 500), neighbors: int = 8,
+                 power: float = 2.0, max_distance: Optional[float] = None,
+                 sensor_ids: Optional[Sequence[Hashable]] = None):
+        self.sensor_positions = np.asarray(sensor_positions, dtype=float)
+        if self.sensor_positions.ndim != 2 or self.sensor_positions.shape[1] != 2:
+            raise ValueError("Sensör konumları (n, 2) boyutunda olmalıdır")
+
+        if sensor_ids is None:
+            sensor_ids = range(len(self.sensor_positions))
+        self.sensor_ids = pd.Index(sensor_ids)
+
+        self.width = width
+        self.height = height
+        self.grid_shape = grid_shape
+        self.neighbors = min(neighbors, len(self.sensor_positions))
+        self.power = power
+        self.max_distance = max_distance
+
+        # Hücre merkezleri
+        rows, cols = grid_shape
+        self.x = (np.arange(cols) + 0.5) * width / cols
+        self.y = (np.arange(rows) + 0.5) * height / rows
+
+        self.weights = self._build_weights()
+
+    def _build_weights(self) -> sparse.csr_matrix:
+        """Mekânsal indeks ile yalnızca yakın sensörlerin ağırlıklarını hesaplar"""
+        xx, yy = np.meshgrid(self.x, self.y)
+        cells = np.column_stack([xx.ravel(), yy.ravel()])
+
+        tree = KDTree(self.sensor_positions)
+        distances, indices = tree.query(cells, k=self.neighbors)
+
+        with np.errstate(divide='ignore'):
+            weights = 1.0 / np.power(distances, self.power)
+
+        # Sensörün tam üzerindeki hücre yalnızca o sensörün değerini alır
+        exact = distances < 1e-9
+        exact_rows = exact.any(axis=1)
+        weights[exact_rows] = exact[exact_rows].astype(float)
+
+        if self.max_distance is not None:
+            weights[distances > self.max_distance] = 0.0
+
+        totals = weights.sum(axis=1, keepdims=True)
+        with np.errstate(invalid='ignore'):
+            weights = np.where(totals > 0, weights / totals, 0.0)
+
+        n_cells = len(cells)
+        rows = np.repeat(np.arange(n_cells), self.neighbors)
+        matrix = sparse.csr_matrix(
+            (weights.ravel(), (rows, indices.ravel())),
+            shape=(n_cells, len(self.sensor_positions))
+        )
+        matrix.eliminate_zeros()
+
+        # Hiçbir sensörün menzilinde olmayan hücreler NaN olarak gösterilir
+        self._uncovered = np.asarray(matrix.getnnz(axis=1) == 0)
+        return matrix
+
+    @classmethod
+    def fingerprint(cls, sensor_positions: np.ndarray, width: float, height: float,
+                    sensor_ids: Optional[Sequence[Hashable]] = None, **layout_options) -> str:
+        """
+        Yerleşimi belirleyen tüm girdilerin (konumlar, kimlikler, boyutlar ve
+        varsayılanlar dahil seçenekler) özetini döndürür. Paylaşılan tabloların
+        güncel yerleşime ait olup olmadığını ağırlıkları hesaplamadan anlamak
+        için kullanılır.
+        """
+        options = {
+            name: param.default
+            for name, param in inspect.signature(cls.__init__).parameters.items()
+            if param.default is not inspect.Parameter.empty and name != 'sensor_ids'
+        }
+        options.update(layout_options)
+        positions = np.ascontiguousarray(sensor_positions, dtype=float)
+
+        digest = hashlib.sha256(positions.tobytes())
+        digest.update(str(positions.shape).encode('utf-8'))
+        digest.update(json.dumps({
+            'width': width,
+            'height': height,
+            'sensor_ids': None if sensor_ids is None else [str(s) for s in sensor_ids],
+            'options': {key: list(value) if isinstance(value, tuple) else value
+                        for key, value in sorted(options.items())}
+        }, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()[:16]
+
+    def export_tables(self) -> Tuple[Dict[str, np.ndarray], Dict]:
+        """Paylaşılan bellekte yayınlamak için ağırlık tablolarını ve üst verisini döndürür"""
+        arrays = {
+            'sensor_positions': self.sensor_positions,
+            'weights_data': self.weights.data,
+            'weights_indices': self.weights.indices,
+            'weights_indptr': self.weights.indptr,
+            'uncovered': self._uncovered
+        }
+        metadata = {
+            'width': self.width,
+            'height': self.height,
+            'grid_shape': list(self.grid_shape),
+            'neighbors': self.neighbors,
+            'power': self.power,
+            'max_distance': self.max_distance,
+            'sensor_ids': self.sensor_ids.tolist()
+        }
+        return arrays, metadata
+
+    @classmethod
+    def from_tables(cls, arrays: Dict[str, np.ndarray], metadata: Dict) -> 'FloorLayout':
+        """Yayınlanmış tablolardan ağırlıkları yeniden hesaplamadan yerleşim oluşturur"""
+        layout = cls.__new__(cls)
+        layout.sensor_positions = arrays['sensor_positions']
+        layout.sensor_ids = pd.Index(metadata['sensor_ids'])
+        layout.width = metadata['width']
+        layout.height = metadata['height']
+        layout.grid_shape = tuple(metadata['grid_shape'])
+        layout.neighbors = metadata['neighbors']
+        layout.power = metadata['power']
+        layout.max_distance = metadata['max_distance']
+
+        rows, cols = layout.grid_shape
+        layout.x = (np.arange(cols) + 0.5) * layout.width / cols
+        layout.y = (np.arange(rows) + 0.5) * layout.height / rows
+
+        layout.weights = sparse.csr_matrix(
+            (arrays['weights_data'], arrays['weights_indices'], arrays['weights_indptr']),
+            shape=(rows * cols, len(layout.sensor_positions)),
+            copy=False
+        )
+        layout._uncovered = arrays['uncovered']
+        return layout
+
+    def interpolate(self, values: np.ndarray) -> np.ndarray:
+        """
+        Sensör değerlerini ızgaraya enterpole eder.
+
+        values: (sensör sayısı,) veya (sensör sayısı, k) boyutlu dizi.
+        (satır, sütun) veya (satır, sütun, k) boyutlu ızgara döndürür.
+
+        Eksik (NaN) sensör değerleri dışarıda bırakılır; her hücre yalnızca
+        değer bildiren komşu sensörlerin ağırlıklarıyla yeniden normalize
+        edilir. Hiçbir komşusu bildirmeyen hücreler NaN olur.
+        """
+        values = np.asarray(values, dtype=float)
+        reported = np.isfinite(values)
+        if reported.all():
+            grid = self.weights @ values
+        else:
+            totals = self.weights @ reported.astype(float)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                grid = (self.weights @ np.where(reported, values, 0.0)) / totals
+            grid[totals <= 1e-12] = np.nan
+        grid[self._uncovered] = np.nan
+        return grid.reshape(self.grid_shape + values.shape[1:])
+
+
+class SpatialInterpolator:
+    """
+    Kat bazında ağırlıkları önbellekleyen ve sensör okumalarından sıcaklık,
+    nem, CO2 ve genel skor ızgaralarını üreten sınıf
+    """
+
+    def __init__(self, data_processor: Optional[AirQualityDataProcessor] = None):
+        self.data_processor = data_processor or AirQualityDataProcessor()
+        self.layouts: Dict[Hashable, FloorLayout] = {}
+        self.snapshots: Dict[Hashable, Dict] = {}
+        self._lock = threading.Lock()
+
+    def register_floor(self, floor_id: Hashable, sensor_positions: pd.DataFrame,
+                       width: float, height: float, **layout_options) -> FloorLayout:
+        """
+        Bir katın sensör yerleşimini kaydeder ve ağırlıkları hesaplar.
+
+        sensor_positions: sensör kimliği ile indekslenmiş 'x' ve 'y' sütunları.
+        """
+        layout = FloorLayout(sensor_positions[['x', 'y']].to_numpy(), width, height,
+                             sensor_ids=sensor_positions.index, **layout_options)
+        self.layouts[floor_id] = layout
+        return layout
+
+    def attach_floor(self, floor_id: Hashable, tables: Dict) -> FloorLayout:
+        """SharedTableStore.attach çıktısından kat yerleşimini bağlar"""
+        layout = FloorLayout.from_tables(tables['arrays'], tables['metadata'])
+        self.layouts[floor_id] = layout
+        return layout
+
+    def load_floor(self, floor_id: Hashable, sensor_positions: pd.DataFrame,
+                   width: float, height: float, store=None, **layout_options) -> FloorLayout:
+        """
+        Kat yerleşimini kaydeder; store (SharedTableStore) verilirse ağırlıklar
+        süreçler arasında paylaşılır.
+
+        Tablo kümesinin adı yerleşim özetini içerir ve bağlanırken üst verideki
+        özet yeniden doğrulanır; sensör konumları veya seçenekler değiştiğinde
+        eski ağırlıklar kullanılmaz, yenileri hesaplanıp yayınlanır.
+        """
+        if store is None:
+            return self.register_floor(floor_id, sensor_positions, width, height, **layout_options)
+
+        positions = sensor_positions[['x', 'y']].to_numpy()
+        fingerprint = FloorLayout.fingerprint(positions, width, height,
+                                              sensor_ids=sensor_positions.index, **layout_options)
+
+        def build():
+            layout = FloorLayout(positions, width, height, sensor_ids=sensor_positions.index, **layout_options)
+            arrays, metadata = layout.export_tables()
+            metadata['fingerprint'] = fingerprint
+            return arrays, metadata
+
+        name = f"floor_{_safe_name(floor_id)}_{fingerprint}"
+        tables = store.attach_or_publish(
+            name, build, metadata_check=lambda metadata: metadata.get('fingerprint') == fingerprint
+        )
+        return self.attach_floor(floor_id, tables)
+
+    def interpolate_floor(self, floor_id: Hashable, readings: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Sensör okumalarını kat ızgarasına enterpole eder.
+
+        readings: sensör kimliği ile indekslenmiş, analyze_air_quality girdi
+        sütunlarını içeren tablo. Her parametre için bir ızgara döndürür.
+        """
+        layout = self.layouts[floor_id]
+        readings = readings.reindex(layout.sensor_ids)
+
+        normalized = self.data_processor.normalize_batch(readings)
+        scores = self.data_processor.calculate_air_quality_scores(normalized)
+
+        values = np.column_stack([
+            readings['temperature'].to_numpy(dtype=float),
+            readings['humidity'].to_numpy(dtype=float),
+            readings['co2'].to_numpy(dtype=float),
+            scores
+        ])
+        grids = layout.interpolate(values)
+
+        return {param: grids[:, :, i] for i, param in enumerate(SPATIAL_PARAMETERS)}
+
+    def refresh_floor(self, floor_id: Hashable, source: Callable[[], pd.DataFrame],
+                      interval: float) -> Dict:
+        """
+        Katın son anlık görüntüsünü döndürür; interval saniyeden eskiyse
+        source() ile yeni okumaları alıp tüm ızgaraları bir kez hesaplar.
+
+        Süre kontrolü, okuma ve enterpolasyon aynı kilit altında yapılır;
+        paylaşılan kaynak oturum başına değil yenileme aralığında bir kez
+        ilerler ve tüm parametre ızgaraları aynı okumalardan gelir.
+        {'readings', 'grids', 'updated_at'} döndürür; ızgaralar oturumlar
+        arasında paylaşıldığı için değiştirilmemelidir.
+        """
+        with self._lock:
+            snapshot = self.snapshots.get(floor_id)
+            if snapshot is None or time.time() - snapshot['updated_at'] >= interval:
+                readings = source()
+                snapshot = {
+                    'readings': readings,
+                    'grids': self.interpolate_floor(floor_id, readings),
+                    'updated_at': time.time()
+                }
+                self.snapshots[floor_id] = snapshot
+            return snapshot
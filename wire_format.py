@@ -0,0 +1,399 @@
+import hashlib
+import json
+import struct
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from air_quality_model import AirQualityAI
+
+MAGIC = b'HKA1'
+VERSION = 1
+KIND_RESULTS = 1
+KIND_READINGS = 2
+FLAG_EMBEDDED_CATALOG = 1
+
+INPUT_COLUMNS = ['temperature', 'humidity', 'co2', 'area', 'occupancy']
+NORMALIZED_PARAMETERS = ['temperature', 'humidity', 'co2', 'area_per_person']
+DETAIL_PARAMETERS = ['temperature', 'humidity', 'co2', 'area_per_person', 'occupancy']
+RESULT_KEYS = {'success', 'score', 'category', 'color', 'recommendations',
+               'detailed_analysis', 'normalized_scores', 'errors'}
+
+# _create_detailed_analysis çıktısındaki sabit alanlar
+DETAIL_CONSTANTS = {
+    'temperature': {'unit': '°C', 'optimal_range': '18-26°C'},
+    'humidity': {'unit': '%', 'optimal_range': '30-60%'},
+    'co2': {'unit': 'ppm', 'optimal_range': '< 1000 ppm'},
+    'area_per_person': {'unit': 'm²/kişi', 'optimal_range': '≥ 20 m²/kişi'},
+    'occupancy': {'unit': 'kişi', 'optimal_range': '≤ 50 kişi'}
+}
+
+_HEADER = struct.Struct('<4sBBBI8s')
+
+
+def build_rule_catalog(ai_model: Optional[AirQualityAI] = None) -> List[Dict]:
+    """
+    Öneri kural kataloğunu oluşturur. Her öneri, bu listedeki sırası
+    (kural kimliği) ile iletilir; metinler gönderilmez.
+    """
+    ai_model = ai_model or AirQualityAI()
+    catalog = [ai_model._general_recommendation()]
+    for parameter, rules in ai_model.recommendations_db.items():
+        for rule in rules:
+            catalog.extend(ai_model._get_parameter_recommendations(parameter, rule['condition']))
+    return catalog
+
+
+def _catalog_fingerprint(catalog: List[Dict]) -> bytes:
+    payload = json.dumps(catalog, ensure_ascii=False, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(payload).digest()[:8]
+
+
+class _Writer:
+    """Uzunluk önekli bölümler halinde bayt dizisi oluşturur"""
+
+    def __init__(self):
+        self.parts: List[bytes] = []
+
+    def blob(self, data: bytes):
+        self.parts.append(struct.pack('<I', len(data)))
+        self.parts.append(data)
+
+    def array(self, array: np.ndarray, dtype: str):
+        self.blob(np.ascontiguousarray(array, dtype=dtype).tobytes())
+
+    def strings(self, values: Sequence[str]):
+        self.blob('\x00'.join(values).encode('utf-8'))
+
+    def getvalue(self, header: bytes) -> bytes:
+        return header + b''.join(self.parts)
+
+
+class _Reader:
+    """_Writer bölümlerini sırayla okur; diziler kopyalanmadan görünüm olarak döner"""
+
+    def __init__(self, data: bytes, offset: int):
+        self.view = memoryview(data)
+        self.offset = offset
+
+    def blob(self) -> memoryview:
+        (length,) = struct.unpack_from('<I', self.view, self.offset)
+        start = self.offset + 4
+        self.offset = start + length
+        return self.view[start:self.offset]
+
+    def array(self, dtype: str, shape=None) -> np.ndarray:
+        array = np.frombuffer(self.blob(), dtype=dtype)
+        return array.reshape(shape) if shape is not None else array
+
+    def strings(self) -> List[str]:
+        raw = bytes(self.blob()).decode('utf-8')
+        return raw.split('\x00') if raw else []
+
+
+class AirQualityWireFormat:
+    """
+    Sensör okumaları ve analyze_air_quality sonuçları için kompakt ikili
+    aktarım biçimi.
+
+    Sayısal alanlar sütun sütun ham little-endian tamponlar olarak, öneriler
+    kural kimliği olarak, tekrar eden diğer metinler (kategori, renk, durum,
+    hata) ise mesaj başına bir kez yazılan sözlüğe indeks olarak gönderilir.
+    Çözücü, mevcut sözlük yapısını aynen geri üretir.
+    """
+
+    def __init__(self, ai_model: Optional[AirQualityAI] = None):
+        self.catalog = build_rule_catalog(ai_model)
+        self.fingerprint = _catalog_fingerprint(self.catalog)
+        self._rule_ids = {self._rule_key(rec): i for i, rec in enumerate(self.catalog)}
+
+    @staticmethod
+    def _rule_key(rec: Dict) -> Tuple:
+        # Düşük/yüksek kuralları aynı başlığı paylaşır, aksiyonlarla ayrılır
+        return rec['type'], rec['priority'], rec['title'], tuple(rec['actions'])
+
+    def _header(self, kind: int, flags: int, count: int) -> bytes:
+        return _HEADER.pack(MAGIC, VERSION, kind, flags, count, self.fingerprint)
+
+    def _read_header(self, data: bytes, kind: int) -> Tuple[int, int, bytes]:
+        magic, version, data_kind, flags, count, fingerprint = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Desteklenmeyen ikili biçim")
+        if data_kind != kind:
+            raise ValueError("Beklenmeyen mesaj türü")
+        return flags, count, fingerprint
+
+    def encode_results(self, results: Sequence[Dict], embed_catalog: bool = False) -> bytes:
+        """
+        analyze_air_quality sonuç listesini kodlar.
+
+        embed_catalog: öneri metinlerini de mesaja ekler (ör. uzun süreli
+        saklama için); aksi halde çözücünün kataloğu kullanılır.
+        """
+        n = len(results)
+        strings: Dict[str, int] = {}
+
+        def string_id(value: str) -> int:
+            idx = strings.get(value)
+            if idx is None:
+                idx = strings[value] = len(strings)
+            return idx
+
+        success = np.zeros(n, dtype=np.uint8)
+        score = np.zeros(n)
+        int_mask = np.zeros(n, dtype=np.uint8)   # bit 0-4: detay değerleri int, bit 5: skor int
+        category = np.zeros(n, dtype=np.uint16)
+        color = np.zeros(n, dtype=np.uint16)
+        normalized = np.zeros((n, len(NORMALIZED_PARAMETERS)))
+        values = np.zeros((n, len(DETAIL_PARAMETERS)))
+        status = np.zeros((n, len(DETAIL_PARAMETERS)), dtype=np.uint16)
+        rec_counts = np.zeros(n, dtype=np.uint8)
+        rule_ids: List[int] = []
+        error_counts = np.zeros(n, dtype=np.uint8)
+        error_ids: List[int] = []
+        extras: List[bytes] = []
+
+        for i, result in enumerate(results):
+            success[i] = result['success']
+            score[i] = result['score']
+            if isinstance(result['score'], int):
+                int_mask[i] |= 1 << 5
+            category[i] = string_id(result['category'])
+
+            recommendations = result['recommendations']
+            rec_counts[i] = len(recommendations)
+            for rec in recommendations:
+                rule_id = self._rule_ids.get(self._rule_key(rec))
+                if rule_id is None or self.catalog[rule_id] != rec:
+                    raise ValueError(f"Katalogda olmayan öneri: {rec.get('title')}")
+                rule_ids.append(rule_id)
+
+            if result['success']:
+                color[i] = string_id(result['color'])
+                normalized[i] = [result['normalized_scores'][param] for param in NORMALIZED_PARAMETERS]
+                detailed = result['detailed_analysis']
+                for j, param in enumerate(DETAIL_PARAMETERS):
+                    item = detailed[param]
+                    values[i, j] = item['value']
+                    if isinstance(item['value'], int):
+                        int_mask[i] |= 1 << j
+                    status[i, j] = string_id(item['status'])
+                    constants = DETAIL_CONSTANTS[param]
+                    if item['unit'] != constants['unit'] or item['optimal_range'] != constants['optimal_range']:
+                        raise ValueError(f"Beklenmeyen detay alanı: {param}")
+            else:
+                errors = result.get('errors', [])
+                error_counts[i] = len(errors)
+                error_ids.extend(string_id(error) for error in errors)
+
+            extra = {key: value for key, value in result.items() if key not in RESULT_KEYS}
+            extras.append(json.dumps(extra, ensure_ascii=False).encode('utf-8') if extra else b'')
+
+        writer = _Writer()
+        writer.strings(list(strings))
+        writer.array(success, '<u1')
+        writer.array(score, '<f8')
+        writer.array(int_mask, '<u1')
+        writer.array(category, '<u2')
+        writer.array(color, '<u2')
+        writer.array(normalized, '<f8')
+        writer.array(values, '<f8')
+        writer.array(status, '<u2')
+        writer.array(rec_counts, '<u1')
+        writer.array(np.array(rule_ids, dtype=np.uint8), '<u1')
+        writer.array(error_counts, '<u1')
+        writer.array(np.array(error_ids, dtype=np.uint16), '<u2')
+        writer.array(np.array([len(extra) for extra in extras], dtype=np.uint32), '<u4')
+        writer.blob(b''.join(extras))
+
+        flags = 0
+        if embed_catalog:
+            flags |= FLAG_EMBEDDED_CATALOG
+            writer.blob(json.dumps(self.catalog, ensure_ascii=False).encode('utf-8'))
+
+        return writer.getvalue(self._header(KIND_RESULTS, flags, n))
+
+    def decode_results(self, data: bytes) -> List[Dict]:
+        """encode_results çıktısını sonuç sözlüklerine geri çevirir"""
+        flags, n, fingerprint = self._read_header(data, KIND_RESULTS)
+        reader = _Reader(data, _HEADER.size)
+
+        strings = reader.strings()
+        success = reader.array('<u1')
+        score = reader.array('<f8')
+        int_mask = reader.array('<u1')
+        category = reader.array('<u2')
+        color = reader.array('<u2')
+        normalized = reader.array('<f8', (n, len(NORMALIZED_PARAMETERS)))
+        values = reader.array('<f8', (n, len(DETAIL_PARAMETERS)))
+        status = reader.array('<u2', (n, len(DETAIL_PARAMETERS)))
+        rec_counts = reader.array('<u1')
+        rule_ids = reader.array('<u1')
+        error_counts = reader.array('<u1')
+        error_ids = reader.array('<u2')
+        extra_lengths = reader.array('<u4')
+        extras_blob = reader.blob()
+
+        if flags & FLAG_EMBEDDED_CATALOG:
+            catalog = json.loads(bytes(reader.blob()).decode('utf-8'))
+        elif fingerprint != self.fingerprint:
+            raise ValueError("Öneri kataloğu uyuşmuyor; mesaj embed_catalog=True ile kodlanmalı")
+        else:
+            catalog = self.catalog
+
+        # Python nesnelerine toplu dönüşüm, satır başına numpy erişiminden hızlıdır
+        score_list = score.tolist()
+        normalized_list = normalized.tolist()
+        values_list = values.tolist()
+        status_list = status.tolist()
+        rule_list = rule_ids.tolist()
+        error_list = error_ids.tolist()
+
+        results = []
+        rule_pos = 0
+        error_pos = 0
+        extra_pos = 0
+        for i in range(n):
+            mask = int(int_mask[i])
+            score_value = int(score_list[i]) if mask & (1 << 5) else score_list[i]
+
+            count = int(rec_counts[i])
+            recommendations = []
+            for rule_id in rule_list[rule_pos:rule_pos + count]:
+                rec = catalog[rule_id]
+                recommendations.append({
+                    'type': rec['type'],
+                    'priority': rec['priority'],
+                    'title': rec['title'],
+                    'description': rec['description'],
+                    'actions': list(rec['actions'])
+                })
+            rule_pos += count
+
+            if success[i]:
+                detailed = {}
+                row_values = values_list[i]
+                row_status = status_list[i]
+                for j, param in enumerate(DETAIL_PARAMETERS):
+                    value = int(row_values[j]) if mask & (1 << j) else row_values[j]
+                    item = {'value': value, 'unit': DETAIL_CONSTANTS[param]['unit']}
+                    if param != 'occupancy':
+                        item['score'] = normalized_list[i][j]
+                    item['status'] = strings[row_status[j]]
+                    item['optimal_range'] = DETAIL_CONSTANTS[param]['optimal_range']
+                    detailed[param] = item
+
+                result = {
+                    'success': True,
+                    'score': score_value,
+                    'category': strings[category[i]],
+                    'color': strings[color[i]],
+                    'recommendations': recommendations,
+                    'detailed_analysis': detailed,
+                    'normalized_scores': dict(zip(NORMALIZED_PARAMETERS, normalized_list[i]))
+                }
+            else:
+                count = int(error_counts[i])
+                result = {
+                    'success': False,
+                    'errors': [strings[idx] for idx in error_list[error_pos:error_pos + count]],
+                    'score': score_value,
+                    'category': strings[category[i]],
+                    'recommendations': recommendations
+                }
+                error_pos += count
+
+            length = int(extra_lengths[i])
+            if length:
+                result.update(json.loads(bytes(extras_blob[extra_pos:extra_pos + length]).decode('utf-8')))
+                extra_pos += length
+            results.append(result)
+
+        return results
+
+    def encode_readings(self, readings: Union[pd.DataFrame, Sequence[Dict[str, float]]]) -> bytes:
+        """Okuma listesini veya tablosunu sütun bazlı ham tamponlar olarak kodlar"""
+        if isinstance(readings, pd.DataFrame):
+            columns = [readings[column].to_numpy() for column in INPUT_COLUMNS]
+            n = len(readings)
+            int_mask = np.zeros(n, dtype=np.uint8)
+            for j, column in enumerate(columns):
+                if np.issubdtype(column.dtype, np.integer):
+                    int_mask |= np.uint8(1 << j)
+            matrix = np.column_stack(columns).astype(float) if n else np.zeros((0, len(INPUT_COLUMNS)))
+        else:
+            n = len(readings)
+            matrix = np.array([[reading[column] for column in INPUT_COLUMNS] for reading in readings],
+                              dtype=float).reshape(n, len(INPUT_COLUMNS))
+            int_mask = np.array([
+                sum(1 << j for j, column in enumerate(INPUT_COLUMNS) if isinstance(reading[column], int))
+                for reading in readings
+            ], dtype=np.uint8)
+
+        writer = _Writer()
+        # Sütun düzeni: her parametre kendi bitişik tamponunda
+        writer.array(matrix.T, '<f8')
+        writer.array(int_mask, '<u1')
+        return writer.getvalue(self._header(KIND_READINGS, 0, n))
+
+    def decode_readings(self, data: bytes, as_frame: bool = False) -> Union[List[Dict], pd.DataFrame]:
+        """encode_readings çıktısını okuma sözlüklerine veya tabloya çevirir"""
+        _, n, _ = self._read_header(data, KIND_READINGS)
+        reader = _Reader(data, _HEADER.size)
+        columns = reader.array('<f8', (len(INPUT_COLUMNS), n))
+        int_mask = reader.array('<u1')
+
+        if as_frame:
+            return pd.DataFrame({column: columns[j] for j, column in enumerate(INPUT_COLUMNS)})
+
+        rows = columns.T.tolist()
+        mask_list = int_mask.tolist()
+        return [
+            {column: int(row[j]) if mask & (1 << j) else row[j] for j, column in enumerate(INPUT_COLUMNS)}
+            for row, mask in zip(rows, mask_list)
+        ]
+
+
+def benchmark(n: int = 10000, seed: int = 0) -> pd.DataFrame:
+    """İkili biçimi json ile boyut ve kodlama/çözme süresi açısından karşılaştırır"""
+    rng = np.random.default_rng(seed)
+    ai_model = AirQualityAI()
+    readings = [{
+        'temperature': round(float(rng.uniform(10, 35)), 1),
+        'humidity': round(float(rng.uniform(10, 90))),
+        'co2': int(rng.integers(350, 2500)),
+        'area': float(rng.choice([50, 100, 200])),
+        'occupancy': int(rng.integers(0, 20))
+    } for _ in range(n)]
+    results = [ai_model.analyze_air_quality(reading) for reading in readings]
+    wire = AirQualityWireFormat(ai_model)
+
+    def measure(encode, decode, payload):
+        start = time.perf_counter()
+        encoded = encode(payload)
+        encode_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        decoded = decode(encoded)
+        decode_seconds = time.perf_counter() - start
+        assert decoded == payload
+        return len(encoded), encode_seconds, decode_seconds
+
+    rows = {}
+    for name, payload, binary_encode, binary_decode in [
+        ('sonuçlar', results, wire.encode_results, wire.decode_results),
+        ('okumalar', readings, wire.encode_readings, wire.decode_readings)
+    ]:
+        rows[(name, 'json')] = measure(
+            lambda p: json.dumps(p, ensure_ascii=False).encode('utf-8'),
+            lambda b: json.loads(b.decode('utf-8')),
+            payload
+        )
+        rows[(name, 'ikili')] = measure(binary_encode, binary_decode, payload)
+
+    table = pd.DataFrame(rows, index=['bayt', 'kodlama_sn', 'çözme_sn']).T
+    table['kayıt_başına_bayt'] = table['bayt'] / n
+    return table
+
+
+if __name__ == "__main__":
+    print(benchmark())
@@ -0,0 +1,157 @@
+import numpy as np
+from typing import Dict, Hashable, List, Optional
+from data_processor import AirQualityDataProcessor
+
+INPUT_COLUMNS = ('temperature', 'humidity', 'co2', 'area', 'occupancy')
+SCORE_PARAMETERS = ('temperature', 'humidity', 'co2', 'area_per_person')
+LEVELS = ('zone', 'line', 'hall', 'site')
+
+# Katkı vektörü düzeni
+_AREA = 0                                   # alan ağırlığı
+_AREA_SCORE = 1                             # alan x skor
+_AREA_PARAMS = slice(2, 6)                  # alan x parametre skorları
+_OCC = 6                                    # doluluk ağırlığı
+_OCC_SCORE = 7                              # doluluk x skor
+_OCC_PARAMS = slice(8, 12)                  # doluluk x parametre skorları
+_LOW_PARAMS = slice(12, 16)                 # eşik altındaki bölge sayısı (parametre başına)
+_ZONES = 16                                 # geçerli okuması olan bölge sayısı
+_WIDTH = 17
+
+
+class ZoneHierarchy:
+    """
+    Bölge → hat → salon → tesis hiyerarşisinde alan ve doluluk ağırlıklı
+    hava kalitesi skorlarını artımlı olarak güncelleyen sınıf.
+
+    Her düğüm, alt ağacındaki bölgelerin ağırlıklı toplamlarını tutar. Bir
+    bölgenin okuması değiştiğinde yalnızca eski ve yeni katkı farkı
+    atalarına eklenir; güncelleme maliyeti O(derinlik)'tir.
+    """
+
+    def __init__(self, data_processor: Optional[AirQualityDataProcessor] = None,
+                 low_score_threshold: float = 0.5):
+        self.data_processor = data_processor or AirQualityDataProcessor()
+        self.low_score_threshold = low_score_threshold
+        self.parent: Dict[Hashable, Optional[Hashable]] = {}
+        self.level: Dict[Hashable, str] = {}
+        self.totals: Dict[Hashable, np.ndarray] = {}
+        self.contributions: Dict[Hashable, np.ndarray] = {}
+        self._ancestors: Dict[Hashable, List[Hashable]] = {}
+
+    def add_node(self, node_id: Hashable, level: str, parent_id: Optional[Hashable] = None):
+        """Hat, salon veya tesis düğümü ekler"""
+        if level not in LEVELS:
+            raise ValueError(f"Geçersiz seviye: {level}")
+        if parent_id is not None and parent_id not in self.parent:
+            raise KeyError(f"Üst düğüm bulunamadı: {parent_id}")
+        if node_id in self.parent:
+            raise ValueError(f"Düğüm zaten mevcut: {node_id}")
+
+        self.parent[node_id] = parent_id
+        self.level[node_id] = level
+        self.totals[node_id] = np.zeros(_WIDTH)
+
+        ancestors = []
+        current = parent_id
+        while current is not None:
+            ancestors.append(current)
+            current = self.parent[current]
+        self._ancestors[node_id] = ancestors
+
+    def add_zone(self, zone_id: Hashable, parent_id: Hashable,
+                 inputs: Optional[Dict[str, float]] = None):
+        """Bölge ekler; okuma verilirse hemen hiyerarşiye yansıtılır"""
+        self.add_node(zone_id, 'zone', parent_id)
+        self.contributions[zone_id] = np.zeros(_WIDTH)
+        if inputs is not None:
+            self.update_zone(zone_id, inputs)
+
+    def _contribution(self, inputs: Dict[str, float]) -> np.ndarray:
+        """Bir bölge okumasının ağırlıklı katkı vektörünü hesaplar"""
+        contribution = np.zeros(_WIDTH)
+        # validate_inputs NaN değerleri geçirir; toplamlara giren bir NaN sonraki
+        # tüm farkları da NaN yapacağından sonlu olmayan okumalar geçersiz sayılır
+        values = np.array([inputs[column] for column in INPUT_COLUMNS], dtype=float)
+        if not np.isfinite(values).all():
+            return contribution
+        is_valid, _ = self.data_processor.validate_inputs(inputs)
+        if not is_valid:
+            return contribution
+
+        normalized = self.data_processor.normalize_inputs(inputs)
+        score = self.data_processor.calculate_air_quality_score(normalized)
+        params = np.array([normalized[param] for param in SCORE_PARAMETERS], dtype=float)
+        if not (np.isfinite(score) and np.isfinite(params).all()):
+            return contribution
+        area = float(inputs['area'])
+        occupancy = float(inputs['occupancy'])
+
+        contribution[_AREA] = area
+        contribution[_AREA_SCORE] = area * score
+        contribution[_AREA_PARAMS] = area * params
+        contribution[_OCC] = occupancy
+        contribution[_OCC_SCORE] = occupancy * score
+        contribution[_OCC_PARAMS] = occupancy * params
+        contribution[_LOW_PARAMS] = params < self.low_score_threshold
+        contribution[_ZONES] = 1
+        return contribution
+
+    def update_zone(self, zone_id: Hashable, inputs: Dict[str, float]):
+        """Bölge okumasını günceller ve farkı tüm atalarına yayar"""
+        if self.level.get(zone_id) != 'zone':
+            raise KeyError(f"Bölge bulunamadı: {zone_id}")
+
+        new = self._contribution(inputs)
+        delta = new - self.contributions[zone_id]
+        self.contributions[zone_id] = new
+
+        self.totals[zone_id] += delta
+        for ancestor in self._ancestors[zone_id]:
+            self.totals[ancestor] += delta
+
+    def rebuild(self):
+        """
+        Tüm toplamları bölge katkılarından yeniden hesaplar. Çok uzun süreli
+        artımlı güncellemelerde biriken kayan nokta hatasını temizlemek için
+        ara sıra çağrılabilir.
+        """
+        for node_id in self.totals:
+            self.totals[node_id] = np.zeros(_WIDTH)
+        for zone_id, contribution in self.contributions.items():
+            self.totals[zone_id] += contribution
+            for ancestor in self._ancestors[zone_id]:
+                self.totals[ancestor] += contribution
+
+    def summary(self, node_id: Hashable) -> Dict:
+        """Bir düğümün ağırlıklı skorlarını ve en kötü parametre özetini döndürür"""
+        totals = self.totals[node_id]
+
+        area_weight = totals[_AREA]
+        occupancy_weight = totals[_OCC]
+        area_score = totals[_AREA_SCORE] / area_weight if area_weight > 0 else 0.0
+        occupancy_score = totals[_OCC_SCORE] / occupancy_weight if occupancy_weight > 0 else area_score
+
+        if area_weight > 0:
+            parameter_scores = dict(zip(SCORE_PARAMETERS, totals[_AREA_PARAMS] / area_weight))
+            worst_parameter = min(parameter_scores, key=parameter_scores.get)
+        else:
+            parameter_scores = {param: 0.0 for param in SCORE_PARAMETERS}
+            worst_parameter = None
+
+        category, color = self.data_processor.get_air_quality_category(area_score)
+
+        return {
+            'level': self.level[node_id],
+            'zone_count': int(totals[_ZONES]),
+            'area_weighted_score': float(area_score),
+            'occupancy_weighted_score': float(occupancy_score),
+            'category': category,
+            'color': color,
+            'parameter_scores': {param: float(value) for param, value in parameter_scores.items()},
+            'worst_parameter': worst_parameter,
+            'zones_below_threshold': dict(zip(SCORE_PARAMETERS, totals[_LOW_PARAMS].astype(int).tolist()))
+        }
+
+    def children(self, node_id: Hashable) -> List[Hashable]:
+        """Bir düğümün doğrudan alt düğümlerini döndürür"""
+        return [child for child, parent in self.parent.items() if parent == node_id]
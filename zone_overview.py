@@ -0,0 +1,177 @@
+import threading
+import time
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, List, Optional, Tuple
+from data_processor import AirQualityDataProcessor
+
+INPUT_COLUMNS = ['temperature', 'humidity', 'co2', 'area', 'occupancy']
+
+
+class ZoneOverview:
+    """
+    Çok sayıda bölgenin hava kalitesi durumunu tutan ve yalnızca değişen
+    bölgeleri yeniden hesaplayan sınıf
+    """
+
+    def __init__(self, data_processor: Optional[AirQualityDataProcessor] = None):
+        self.data_processor = data_processor or AirQualityDataProcessor()
+        self.state = pd.DataFrame(
+            columns=INPUT_COLUMNS + ['valid', 'score', 'category', 'color']
+        )
+        self.last_update = 0.0
+        self.last_changed_count = 0
+        self._lock = threading.Lock()
+
+    def update(self, readings: pd.DataFrame) -> List:
+        """
+        Yeni bölge okumalarını uygular ve değişen bölgeleri yeniden puanlar.
+
+        readings: bölge kimliği ile indekslenmiş, INPUT_COLUMNS sütunlarını
+        içeren tablo. Değişen bölge kimliklerinin listesini döndürür.
+        """
+        with self._lock:
+            return self._apply(readings)
+
+    def refresh(self, source: Callable[[], pd.DataFrame], interval: float) -> bool:
+        """
+        Son yenilemeden bu yana interval saniye geçtiyse source() ile yeni
+        okumaları alıp uygular.
+
+        Süre kontrolü, okuma ve güncelleme aynı kilit altında yapılır; aynı
+        anda gelen oturumlardan yalnızca biri yenileme yapar. Yenileme
+        yapıldıysa True döndürür.
+        """
+        with self._lock:
+            if time.time() - self.last_update < interval:
+                return False
+            self._apply(source())
+            return True
+
+    def _apply(self, readings: pd.DataFrame) -> List:
+        """update gövdesi; çağıran kilidi tutmalıdır"""
+        readings = readings[INPUT_COLUMNS].astype(float)
+
+        known = readings.index.intersection(self.state.index)
+        new = readings.index.difference(self.state.index)
+
+        previous = self.state.loc[known, INPUT_COLUMNS].astype(float)
+        changed_mask = (readings.loc[known] != previous).any(axis=1)
+        changed = known[changed_mask.to_numpy()].append(new)
+
+        if len(changed):
+            self._score(readings.loc[changed])
+        self.last_update = time.time()
+        self.last_changed_count = len(changed)
+
+        return list(changed)
+
+    def _score(self, readings: pd.DataFrame):
+        """Verilen bölgeleri tek toplu geçişte puanlar"""
+        valid = self.data_processor.validate_batch(readings)
+        normalized = self.data_processor.normalize_batch(readings)
+        scores = np.where(valid, self.data_processor.calculate_air_quality_scores(normalized), 0.0)
+        categories, colors = self.data_processor.get_air_quality_categories(scores)
+        categories = np.where(valid, categories, 'Geçersiz')
+        colors = np.where(valid, colors, 'gray')
+
+        scored = readings.copy()
+        scored['valid'] = valid
+        scored['score'] = scores
+        scored['category'] = categories
+        scored['color'] = colors
+
+        if self.state.empty:
+            self.state = scored
+        else:
+            new = scored.index.difference(self.state.index)
+            if len(new):
+                self.state = pd.concat([self.state, scored.loc[new]])
+            known = scored.index.difference(new)
+            self.state.loc[known, scored.columns] = scored.loc[known]
+
+    def table(self) -> pd.DataFrame:
+        """Bölge tablosunu en düşük skordan başlayarak döndürür"""
+        with self._lock:
+            table = self.state.copy()
+        table = table.astype({'score': float})
+        table['area_per_person'] = np.where(
+            table['occupancy'] > 0, table['area'] / table['occupancy'].where(table['occupancy'] > 0, 1), table['area']
+        )
+        return table.sort_values('score')
+
+    def grid(self, columns: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Isı haritası için skor ve etiket ızgaralarını döndürür.
+
+        Bölgeler kimlik sırasına göre satır satır yerleştirilir; boş hücreler
+        ve geçersiz okumalı bölgeler NaN'dır.
+        """
+        with self._lock:
+            state = self.state.sort_index()
+
+        n = len(state)
+        columns = columns or max(1, int(np.ceil(np.sqrt(n))))
+        rows = max(1, int(np.ceil(n / columns)))
+
+        scores = np.full(rows * columns, np.nan)
+        labels = np.full(rows * columns, '', dtype=object)
+        scores[:n] = np.where(state['valid'].to_numpy(dtype=bool), state['score'].to_numpy(dtype=float), np.nan)
+        labels[:n] = [f"{zone}<br>{category}" for zone, category in zip(state.index, state['category'])]
+
+        return scores.reshape(rows, columns), labels.reshape(rows, columns)
+
+    def zone_ids(self) -> List:
+        """Bölge kimliklerini skordan bağımsız, sabit sırada döndürür"""
+        with self._lock:
+            return sorted(self.state.index)
+
+    def is_valid(self, zone_id) -> bool:
+        """Bölgenin son okumasının doğrulamadan geçip geçmediğini döndürür"""
+        with self._lock:
+            return bool(self.state.loc[zone_id, 'valid'])
+
+    def inputs(self, zone_id) -> Dict[str, float]:
+        """Bir bölgenin analiz için girdi sözlüğünü döndürür"""
+        with self._lock:
+            row = self.state.loc[zone_id, INPUT_COLUMNS]
+        inputs = {column: float(row[column]) for column in INPUT_COLUMNS}
+        if np.isfinite(inputs['occupancy']):
+            inputs['occupancy'] = int(inputs['occupancy'])
+        return inputs
+
+
+class ZoneReadingSimulator:
+    """
+    Gerçek sensör akışı bağlanana kadar bölge okumalarını üreten demo kaynağı.
+    Her çağrıda bölgelerin yalnızca bir kısmı değişir.
+    """
+
+    def __init__(self, n_zones: int = 400, change_fraction: float = 0.1, seed: int = 42):
+        self.rng = np.random.default_rng(seed)
+        self.change_fraction = change_fraction
+        zone_ids = [f"B{i + 1:03d}" for i in range(n_zones)]
+        self.readings = pd.DataFrame({
+            'temperature': self.rng.normal(23, 3, n_zones).round(1),
+            'humidity': self.rng.normal(45, 10, n_zones).clip(5, 95).round(0),
+            'co2': self.rng.normal(800, 250, n_zones).clip(350, 4000).round(-1),
+            'area': self.rng.choice([50.0, 100.0, 200.0, 400.0], n_zones),
+            'occupancy': self.rng.integers(1, 30, n_zones).astype(float)
+        }, index=pd.Index(zone_ids, name='zone'))
+
+    def next(self) -> pd.DataFrame:
+        """Bir sonraki okuma setini döndürür"""
+        n = len(self.readings)
+        changed = self.rng.random(n) < self.change_fraction
+        k = int(changed.sum())
+        if k:
+            self.readings.loc[changed, 'temperature'] = (
+                self.readings.loc[changed, 'temperature'] + self.rng.normal(0, 0.5, k)
+            ).round(1)
+            self.readings.loc[changed, 'humidity'] = (
+                self.readings.loc[changed, 'humidity'] + self.rng.normal(0, 2, k)
+            ).clip(5, 95).round(0)
+            self.readings.loc[changed, 'co2'] = (
+                self.readings.loc[changed, 'co2'] + self.rng.normal(0, 60, k)
+            ).clip(350, 4000).round(-1)
+        return self.readings.copy()